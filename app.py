@@ -1,5 +1,4 @@
 import copy
-import datetime
 import locale
 import threading
 import time
@@ -8,25 +7,30 @@ from dash import html
 from datetime import timedelta
 from threading import Thread
 
-from flask import request, make_response, send_from_directory
+from flask import request, make_response, send_from_directory, jsonify
 from flask_talisman import Talisman
 
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import pytz
-import requests
-import schedule
 from dash.dependencies import Input, Output, ClientsideFunction
 from dash.exceptions import PreventUpdate
 
 import constants
+from cards import CARD_FIELDS
 from custom_dash_app import CustomDash
+from data_snapshot import read_current_snapshot_name
+from data_state import DataState
+from http_client import http_client
+from ingest import DataIngest, load_data_state_from_snapshot, schedule_jobs
+from leader_election import leader_election
 import logger
 from html_components import create_page_components, locale_language
 from resources import load_resource, start_translation, standard_colors
-from utils import is_debug_mode_enabled, is_macos_mode_enabled, layout, load_csv_from_file, load_csv, \
-    send_one_signal_notification, send_one_signal_notification_for_dataframe_update
+from scheduler import scheduler
+from source_polling import source_polling
+from utils import is_debug_mode_enabled, is_macos_mode_enabled, layout, send_one_signal_notification, \
+    format_value_string_to_locale, is_data_loader_enabled, is_refresh_in_subprocess_enabled
 
 app_start_time = time.time()
 threading.current_thread().name = "main-thread"
@@ -66,39 +70,16 @@ app = CustomDash(
 
 server = app.server
 
-field_list_to_rate_italian_regions = ['ricoverati_con_sintomi', 'terapia_intensiva',
-                                      'totale_ospedalizzati', 'isolamento_domiciliare',
-                                      'totale_positivi', 'nuovi_positivi', 'dimessi_guariti',
-                                      'deceduti', 'casi_da_sospetto_diagnostico', 'casi_da_screening', 'totale_casi',
-                                      'tamponi', 'casi_testati']
-
-italy_regional_population = load_csv_from_file('assets/italy_region_population_2020.csv')
-italy_ICU = load_csv_from_file('assets/italian_ICU_19_10_2020.csv')
-world_population = load_csv_from_file('assets/worldwide_population_2020.csv')
-last_update_content_regional_data = 0
-last_update_content_national_data = 0
-last_update_content_worldwide_aggregate_data = 0
-last_update_content_country_world_data = 0
-last_update_content_vaccines_italy_data = 0
-df_regional_data: pd.DataFrame
-df_national_data: pd.DataFrame
-df_vaccines_italy_summary_latest: pd.DataFrame
-df_vaccines_italy_registry_summary_latest: pd.DataFrame
-df_vaccines_italy_administration: pd.DataFrame
-df_vaccines_italy_admin_summary_latest: pd.DataFrame
-df_vaccines_italy_admin_summary_latest_grouped_by_ITA: pd.DataFrame
-df_vaccines_italy_daily_summary_latest_grouped_by_ITA: pd.DataFrame
-df_vaccines_italy_administration_point: pd.DataFrame
-df_worldwide_aggregate_data: pd.DataFrame
-df_country_world_data: pd.DataFrame
-df_rate_regional: pd.DataFrame
-df_rate_country_world: pd.DataFrame
+# Datasets served by the callbacks. A refresh publishes a new DataState replacing this reference, callbacks read it
+# once and use that state for all their data
+data_state = DataState()
 visitors = []
-last_check_for_update = None
-
-
-def format_value_string_to_locale(value):
-    return locale.format_string('%.0f', value, True)
+# The data loader checks the data sources and publishes a snapshot for each data version, the other processes (e.g.
+# the other gunicorn workers) memory-map the snapshot published instead of loading their own copy of the data. The
+# data loader is the leader elected among the processes which can be the data loader, 'python -m ingest run' too
+data_loader_enabled = is_data_loader_enabled()
+# Name of the snapshot the current data state was loaded from, when the data are read from the snapshots
+data_snapshot_name = None
 
 
 def create_figure(data, title):
@@ -131,11 +112,11 @@ def create_scatter_plot(data_frame, title, x_axis_data, y_axis_data_mapping):
     return figure
 
 
-def create_scatter_plot_by_region(data_frame, title, x_axis_data, y_axis_data_mapping_region):
+def create_scatter_plot_by_region(data_cube, title, y_axis_data_mapping_region):
     scatter_list = []
     y_axis_data_mapping_region.sort(key=lambda tup: tup[1])
     for field, region in y_axis_data_mapping_region:
-        scatter = go.Scattergl(x=x_axis_data, y=data_frame[data_frame['denominazione_regione'] == region][field],
+        scatter = go.Scattergl(x=data_cube.dates, y=data_cube.get_series(field, region),
                                mode='lines',
                                opacity=0.7,
                                name=region,
@@ -146,11 +127,11 @@ def create_scatter_plot_by_region(data_frame, title, x_axis_data, y_axis_data_ma
     return figure
 
 
-def create_scatter_plot_by_country_world(data_frame, title, x_axis_data, y_axis_data_mapping_country_world):
+def create_scatter_plot_by_country_world(data_cube, title, y_axis_data_mapping_country_world):
     scatter_list = []
     y_axis_data_mapping_country_world.sort(key=lambda tup: tup[1])
     for field, country in y_axis_data_mapping_country_world:
-        scatter = go.Scattergl(x=x_axis_data, y=data_frame[data_frame['Country'] == country][field],
+        scatter = go.Scattergl(x=data_cube.dates, y=data_cube.get_series(field, country),
                                mode='lines',
                                opacity=0.7,
                                name=country,
@@ -163,9 +144,7 @@ def create_scatter_plot_by_country_world(data_frame, title, x_axis_data, y_axis_
 
 @app.callback(Output('dropdown_region_list_selected', 'value'), [Input('dropdown_italy_data_selected', 'value')])
 def initialize_dropdown_region_data_selected(data_selected):
-    df = df_regional_data.tail(21)
-    df = df.sort_values(by=[data_selected]).tail(3)
-    return df['denominazione_regione'].tolist()
+    return data_state.regional_rankings.get_top(data_selected, 3)[::-1]
 
 
 # Callback for timeseries/region
@@ -178,20 +157,15 @@ def update_regions_line_chart(region_list, data_selected):
         raise PreventUpdate
     for region in region_list:
         regions_list_mapping.append((data_selected, region))
-    x_axis_data = df_regional_data[df_regional_data['denominazione_regione'] == "Abruzzo"]['data']
     title = load_resource(data_selected)
-    figure = create_scatter_plot_by_region(df_regional_data, title,
-                                           x_axis_data, regions_list_mapping)
+    figure = create_scatter_plot_by_region(data_state.regional_data_cube, title, regions_list_mapping)
     log.info('Updating Italy Line chart')
     return figure
 
 
 @app.callback(Output('dropdown_country_list_selected', 'value'), [Input('dropdown_country_data_selected', 'value')])
 def initialize_dropdown_country_data_selected(data_selected):
-    df_country_world_data.sort_values(by=[constants.DATE_PROPERTY_NAME_EN], inplace=True)
-    df = df_country_world_data.tail(constants.NUMBER_OF_WORLD_COUNTRIES)
-    df = df.sort_values(by=[data_selected]).tail(3)
-    return df['Country'].tolist()
+    return data_state.country_world_rankings.get_top(data_selected, 3)[::-1]
 
 
 # Callback for timeseries/country
@@ -204,20 +178,19 @@ def update_country_world_line_chart(country_list, data_selected):
         raise PreventUpdate
     for country in country_list:
         countries_list_mapping.append((data_selected, country))
-    x_axis_data = df_country_world_data[df_country_world_data['Country'] == "Italy"][constants.DATE_PROPERTY_NAME_EN]
     title = load_resource(data_selected)
-    figure = create_scatter_plot_by_country_world(df_country_world_data, title,
-                                                  x_axis_data, countries_list_mapping)
+    figure = create_scatter_plot_by_country_world(data_state.country_world_data_cube, title, countries_list_mapping)
     log.info('Updating Country World Line chart')
     return figure
 
 
 @app.callback(Output('italy_map', 'figure'), [Input('dropdown_italy_data_selected', 'value')])
 def update_italy_map(data_selected):
-    df = df_rate_regional.tail(21)
+    state = data_state
+    df = state.df_rate_regional.copy()
     df['population'] = pd.to_numeric(df['population'], downcast='float')
     df['population'] = df['population'].apply(format_value_string_to_locale)
-    date_string = df_national_data.iloc[-1]['data'].strftime('%d/%m/%Y')
+    date_string = state.df_national_data.iloc[-1]['data'].strftime('%d/%m/%Y')
     figure = px.choropleth_mapbox(df, geojson=constants.URL_GEOJSON_REGIONS, locations='codice_regione',
                                   featureidkey="properties.reg_istat_code_num",
                                   color=data_selected,
@@ -249,7 +222,7 @@ def update_italy_map(data_selected):
 
 @app.callback(Output('world_map', 'figure'), [Input('dropdown_country_data_selected', 'value')])
 def update_world_map(data_selected):
-    df = df_rate_country_world.copy()
+    df = data_state.df_rate_country_world.copy()
     df = df[~df['Country'].isin(constants.LIST_OF_NOT_LOCATED_COUNTRIES_ON_MAP)]
     df['Population'] = pd.to_numeric(df['Population'], downcast='float')
     df['Population'] = df['Population'].apply(format_value_string_to_locale)
@@ -287,7 +260,7 @@ def update_world_map(data_selected):
 @app.callback(Output('linear_chart_italy', 'figure'), [Input('dropdown_italy_data_selected', 'value')])
 def update_italian_line_chart(data_selected):
     layout_italian_active_cases = copy.deepcopy(layout)
-    df = df_national_data
+    df = data_state.df_national_data
     colors = ["rgb(204, 51, 0)", "rgb(4, 74, 152)", "rgb(123, 199, 255)"]
     x_list = df[constants.DATE_PROPERTY_NAME_IT]
     y_data_selected = df[data_selected].values.tolist()
@@ -346,7 +319,7 @@ def update_italian_line_chart(data_selected):
 @app.callback(Output('linear_chart_world', 'figure'), [Input('dropdown_country_data_selected', 'value')])
 def update_world_line_chart(data_selected):
     layout_world_linear_chart = copy.deepcopy(layout)
-    df = df_worldwide_aggregate_data
+    df = data_state.df_worldwide_aggregate_data
     y_list_1 = df[data_selected].values.tolist()
     x_list = df[constants.DATE_PROPERTY_NAME_EN]
     data = [
@@ -371,15 +344,12 @@ def update_world_line_chart(data_selected):
 
 @app.callback(Output('bar_graph_tab2', 'figure'), [Input('dropdown_region_selected', 'value')])
 def update_regional_graph_active_cases(region_selected):
+    state = data_state
     layout_italian_active_cases = copy.deepcopy(layout)
-    df = df_regional_data[df_regional_data['denominazione_regione'] == region_selected]
-    # Since we filter based on the region, our indexes are not sequential anymore
-    # so we reindex to access to specific row easier later
-    df.reset_index(inplace=True)
-    y_list_1 = df['terapia_intensiva'].values.tolist()
-    y_list_2 = df['ricoverati_con_sintomi'].values.tolist()
-    y_list_3 = df['isolamento_domiciliare'].values.tolist()
-    x_list = df['data']
+    y_list_1 = state.regional_data_cube.get_series('terapia_intensiva', region_selected).tolist()
+    y_list_2 = state.regional_data_cube.get_series('ricoverati_con_sintomi', region_selected).tolist()
+    y_list_3 = state.regional_data_cube.get_series('isolamento_domiciliare', region_selected).tolist()
+    x_list = state.regional_data_cube.dates
     data = [
         dict(
             type="scatter",
@@ -416,13 +386,6 @@ def update_regional_graph_active_cases(region_selected):
     return figure
 
 
-def calculate_total_and_variation_for_national_data(field):
-    card_value = df_national_data[field].iloc[-1]
-    card_value_previous_day = df_national_data[field].iloc[-2]
-    variation_previous_day = card_value - card_value_previous_day
-    return card_value, variation_previous_day
-
-
 @app.callback([Output('total_cases_text', 'children'),
                Output('total_positive_text', 'children'),
                Output('total_recovered_text', 'children'),
@@ -442,23 +405,12 @@ def calculate_total_and_variation_for_national_data(field):
                Output('sub_header_italian_update', 'children')
                ], [Input("i_news", "n_intervals")])
 def update_national_cards_text(self):
+    state = data_state
     log.info('Updating cards')
-    last_df_data_update = get_last_df_data_update(df_national_data, constants.DATE_PROPERTY_NAME_IT)
+    last_df_data_update = get_last_df_data_update(state.df_national_data, constants.DATE_PROPERTY_NAME_IT)
     sub_header_italian_text = load_resource('header_last_update_italy') + last_df_data_update
-    field_list = ['totale_casi', 'totale_positivi', 'dimessi_guariti', 'deceduti',
-                  'terapia_intensiva', 'pressure_ICU', 'tamponi', 'ratio_n_pos_tamponi']
-    percentage_list = ['ratio_n_pos_tamponi', 'pressure_ICU']
-    total_text_values = []
-    variation_text_values = []
-    for field in field_list:
-        card_value, variation_previous_day = calculate_total_and_variation_for_national_data(field)
-        percentage = ' %' if field in percentage_list else ''
-        total_text = f'{card_value:n}{percentage}'
-        total_text_values.append(total_text)
-        sign = '+' if variation_previous_day > 0 else ''
-        variation_text = f'{sign}{variation_previous_day:n}{percentage}'
-        variation_text_values.append(variation_text)
-    return *total_text_values, *variation_text_values, sub_header_italian_text
+    cards = [state.national_cards[field] for field in CARD_FIELDS['national']]
+    return *[card.text for card in cards], *[card.variation_text for card in cards], sub_header_italian_text
 
 
 @app.callback([Output('total_cases_variation', 'style'),
@@ -471,29 +423,8 @@ def update_national_cards_text(self):
                Output('ratio_n_pos_tamponi_variation', 'style')
                ], [Input("i_news", "n_intervals")])
 def update_national_cards_color(self):
-    field_list = ['totale_casi', 'totale_positivi', 'dimessi_guariti', 'deceduti',
-                  'terapia_intensiva', 'pressure_ICU', 'tamponi', 'ratio_n_pos_tamponi']
-    green_positive_results = ['tamponi', 'dimessi_guariti']
-    green_negative_results = ['terapia_intensiva', 'totale_positivi', 'ratio_n_pos_tamponi', 'pressure_ICU']
-    color_cards_list = []
-    for field in field_list:
-        _, variation_previous_day = calculate_total_and_variation_for_national_data(field)
-        if field in green_positive_results and variation_previous_day > 0 or \
-                field in green_negative_results and variation_previous_day < 0:
-            color = 'limegreen'
-            color_cards_list.append(color)
-        else:
-            color = 'red'
-            color_cards_list.append(color)
-    dictionary_color = [{'color': color_cards_list[0]},
-                        {'color': color_cards_list[1]},
-                        {'color': color_cards_list[2]},
-                        {'color': color_cards_list[3]},
-                        {'color': color_cards_list[4]},
-                        {'color': color_cards_list[5]},
-                        {'color': color_cards_list[6]},
-                        {'color': color_cards_list[7]}]
-    return dictionary_color
+    state = data_state
+    return [{'color': state.national_cards[field].color} for field in CARD_FIELDS['national']]
 
 
 @app.callback([Output('confirmed_text_worldwide_aggregate', 'children'),
@@ -505,22 +436,12 @@ def update_national_cards_color(self):
                Output('sub_header_worldwide_update', 'children')
                ], [Input("i_news", "n_intervals")])
 def update_world_cards_text(self):
+    state = data_state
     log.info('Updating World Cards')
-    last_df_data_update = get_last_df_data_update(df_worldwide_aggregate_data, constants.DATE_PROPERTY_NAME_EN)
+    last_df_data_update = get_last_df_data_update(state.df_worldwide_aggregate_data, constants.DATE_PROPERTY_NAME_EN)
     sub_header_worldwide_text = load_resource('header_last_update_world') + last_df_data_update
-    field_list = ['Confirmed', 'Deaths', 'Increase rate']
-    total_text_values = []
-    variation_text_values = []
-    for field in field_list:
-        card_value = df_worldwide_aggregate_data[field].iloc[-1]
-        card_value_previous_day = df_worldwide_aggregate_data[field].iloc[-2]
-        variation_previous_day = card_value - card_value_previous_day
-        total_text = f'{card_value:n}'
-        total_text_values.append(total_text)
-        sign = '+' if variation_previous_day > 0 else ''
-        variation_text = f'{sign}{variation_previous_day:n}'
-        variation_text_values.append(variation_text)
-    return *total_text_values, *variation_text_values, sub_header_worldwide_text
+    cards = [state.worldwide_cards[field] for field in CARD_FIELDS['worldwide']]
+    return *[card.text for card in cards], *[card.variation_text for card in cards], sub_header_worldwide_text
 
 
 @app.callback([Output('confirmed_variation_worldwide_aggregate', 'style'),
@@ -528,40 +449,20 @@ def update_world_cards_text(self):
                Output('increase_rate_variation_worldwide_aggregate', 'style')
                ], [Input("i_news", "n_intervals")])
 def update_world_cards_color(self):
-    field_list = ['Confirmed', 'Deaths', 'Increase rate']
-    color_cards_list = []
-    for field in field_list:
-        card_value = df_worldwide_aggregate_data[field].iloc[-1]
-        card_value_previous_day = df_worldwide_aggregate_data[field].iloc[-2]
-        variation_previous_day = card_value - card_value_previous_day
-        if variation_previous_day <= 0 and field == 'Confirmed':
-            color = 'limegreen'
-            color_cards_list.append(color)
-        else:
-            color = 'red'
-            color_cards_list.append(color)
-    dictionary_color = [{'color': color_cards_list[0]},
-                        {'color': color_cards_list[1]},
-                        {'color': color_cards_list[2]}]
-    return dictionary_color
+    state = data_state
+    return [{'color': state.worldwide_cards[field].color} for field in CARD_FIELDS['worldwide']]
 
 
 @app.callback(Output('table_tab_country_world', 'figure'), [Input("dropdown_country_data_selected", "value")])
 def update_data_table_country_world(data_selected):
-    df_sub = df_country_world_data
-    df = df_sub.copy()
-    df = df.sort_values(by=[constants.DATE_PROPERTY_NAME_EN])
-    df = df.tail(constants.NUMBER_OF_WORLD_COUNTRIES)
-    df.sort_values(by=[data_selected], ascending=False, inplace=True)
-    df[data_selected] = pd.to_numeric(df[data_selected], downcast='float')
-    df[data_selected] = df[data_selected].apply(format_value_string_to_locale)
+    countries, values = data_state.country_world_rankings.get_table(data_selected)
     figure = go.Figure(data=[go.Table(
         header=dict(values=(load_resource('Country'), load_resource(data_selected)),
                     fill_color='lightskyblue',
                     font_color='white',
                     font_size=15,
                     align='left'),
-        cells=dict(values=[df['Country'], df[data_selected]],
+        cells=dict(values=[countries, values],
                    fill_color='whitesmoke',
                    align='center',
                    font_size=13,
@@ -573,17 +474,14 @@ def update_data_table_country_world(data_selected):
 
 @app.callback(Output('table_tab_italy', 'figure'), [Input("dropdown_italy_data_selected", "value")])
 def update_data_table_national(data_selected):
-    df = df_regional_data.tail(21)
-    df = df.sort_values(by=[data_selected], ascending=False)
-    df[data_selected] = pd.to_numeric(df[data_selected], downcast='float')
-    df[data_selected] = df[data_selected].apply(format_value_string_to_locale)
+    regions, values = data_state.regional_rankings.get_table(data_selected)
     figure = go.Figure(data=[go.Table(
         header=dict(values=(load_resource('denominazione_regione'), load_resource(data_selected)),
                     fill_color='lightskyblue',
                     font_color='white',
                     font_size=15,
                     align='left'),
-        cells=dict(values=[df['denominazione_regione'], df[data_selected]],
+        cells=dict(values=[regions, values],
                    fill_color='whitesmoke',
                    align='center',
                    font_size=13,
@@ -612,25 +510,12 @@ def update_data_table_national(data_selected):
                Output('sub_header_ita_regions_update', 'children'),
                ], [Input("dropdown_region_selected", "value")])
 def update_regional_cards_text(region_selected):
+    state = data_state
     log.info('Updating regional cards')
-    last_df_data_update = get_last_df_data_update(df_regional_data, constants.DATE_PROPERTY_NAME_IT)
+    last_df_data_update = get_last_df_data_update(state.df_regional_data, constants.DATE_PROPERTY_NAME_IT)
     sub_header_ita_regions_text = load_resource('header_last_update_italy') + last_df_data_update
-    field_list = ['totale_casi', 'totale_positivi', 'dimessi_guariti', 'deceduti',
-                  'terapia_intensiva', 'pressure_ICU', 'isolamento_domiciliare', 'tamponi']
-    total_text_values = []
-    variation_text_values = []
-    df = df_regional_data[df_regional_data['denominazione_regione'] == region_selected]
-    for field in field_list:
-        card_value = df[field].iloc[-1]
-        card_value_previous_day = df[field].iloc[-2]
-        variation_previous_day = card_value - card_value_previous_day
-        percentage = ' %' if field == 'pressure_ICU' else ''
-        total_text = f'{card_value:n}{percentage}'
-        total_text_values.append(total_text)
-        sign = '+' if variation_previous_day > 0 else ''
-        variation_text = f'{sign}{variation_previous_day:n}{percentage}'
-        variation_text_values.append(variation_text)
-    return *total_text_values, *variation_text_values, sub_header_ita_regions_text
+    cards = [state.regional_cards[region_selected][field] for field in CARD_FIELDS['regional']]
+    return *[card.text for card in cards], *[card.variation_text for card in cards], sub_header_ita_regions_text
 
 
 @app.callback([Output('total_cases_variation_tab2', 'style'),
@@ -643,39 +528,8 @@ def update_regional_cards_text(region_selected):
                Output('total_swabs_variation_tab2', 'style')
                ], [Input("dropdown_region_selected", "value")])
 def update_regional_cards_color(region_selected):
-    field_list = ['totale_casi', 'totale_positivi', 'dimessi_guariti', 'deceduti',
-                  'terapia_intensiva', 'pressure_ICU', 'isolamento_domiciliare', 'tamponi']
-    color_cards_list = []
-    df = df_regional_data[df_regional_data['denominazione_regione'] == region_selected]
-    for field in field_list:
-        card_value = df[field].iloc[-1]
-        card_value_previous_day = df[field].iloc[-2]
-        variation_previous_day = card_value - card_value_previous_day
-        if variation_previous_day < 1 and field == 'totale_casi' or \
-                variation_previous_day < 0 and field == 'totale_positivi' or \
-                variation_previous_day > 0 and field == 'dimessi_guariti' or \
-                variation_previous_day == 0 and field == 'deceduti' or \
-                (variation_previous_day <= 0 and card_value == 0) and field == 'ricoverati_con_sintomi' or \
-                (variation_previous_day <= 0 and card_value == 0) and field == 'terapia_intensiva' or \
-                variation_previous_day < 0 and field == 'ricoverati_con_sintomi' or \
-                variation_previous_day < 0 and field == 'terapia_intensiva' or \
-                variation_previous_day < 0 and field == 'isolamento_domiciliare' or \
-                variation_previous_day > 0 and field == 'tamponi' or \
-                variation_previous_day < 0 and field == 'pressure_ICU':
-            color = 'limegreen'
-            color_cards_list.append(color)
-        else:
-            color = 'red'
-            color_cards_list.append(color)
-    dictionary_color = [{'color': color_cards_list[0]},
-                        {'color': color_cards_list[1]},
-                        {'color': color_cards_list[2]},
-                        {'color': color_cards_list[3]},
-                        {'color': color_cards_list[4]},
-                        {'color': color_cards_list[5]},
-                        {'color': color_cards_list[6]},
-                        {'color': color_cards_list[7]}]
-    return dictionary_color
+    state = data_state
+    return [{'color': state.regional_cards[region_selected][field].color} for field in CARD_FIELDS['regional']]
 
 
 @app.callback([Output('mean_total_cases', 'children'),
@@ -683,11 +537,10 @@ def update_regional_cards_color(region_selected):
                Output('string_max_value_new_positives', 'children'),
                ], [Input("dropdown_region_selected", "value")])
 def update_regional_details_card(region_selected):
-    df = df_regional_data[df_regional_data['denominazione_regione'] == region_selected]
-    rounded_mean = round(df['nuovi_positivi'].mean())
-    max_value_new_positives = df['nuovi_positivi'].max()
-    df_sub = df.loc[df['nuovi_positivi'] == max_value_new_positives]
-    date_max_value = df_sub['data']
+    dates, new_positives = data_state.regional_data_cube.get_available_series('nuovi_positivi', region_selected)
+    rounded_mean = round(new_positives.mean())
+    max_value_new_positives = new_positives.max()
+    date_max_value = dates[new_positives == max_value_new_positives]
     string_max_date = ""
     for date in date_max_value:
         string_max_date = string_max_date + str(date.strftime('%d/%m/%Y')) + '\n'
@@ -703,29 +556,10 @@ def update_regional_details_card(region_selected):
                Output('total_deaths_variation_world', 'children'),
                ], [Input("dropdown_country_selected", "value")])
 def update_country_world_cards_text(country_selected):
+    state = data_state
     log.info('Updating Country cards')
-    field_list = ['Confirmed', 'Active_cases', 'Deaths']
-    total_text_values = []
-    variation_text_values = []
-    df_sub = df_country_world_data[df_country_world_data['Country'] == country_selected]
-    df = df_sub.copy()
-    df_sorted = df.sort_values(by=[constants.DATE_PROPERTY_NAME_EN])
-    df_sorted = df_sorted.tail(
-        constants.NUMBER_OF_WORLD_COUNTRIES + len(constants.LIST_OF_WORLD_COUNTRIES_WITHOUT_DATA))
-    for field in field_list:
-        if country_selected in constants.LIST_OF_WORLD_COUNTRIES_WITHOUT_DATA:
-            total_text_values = ['N/D'] * 4
-            variation_text_values = ['N/D'] * 4
-        else:
-            card_value = df_sorted[field].iloc[-1]
-            card_value_previous_day = df_sorted[field].iloc[-2]
-            variation_previous_day = card_value - card_value_previous_day
-            total_text = f'{card_value:n}'
-            total_text_values.append(total_text)
-            sign = '+' if variation_previous_day > 0 else ''
-            variation_text = f'{sign}{variation_previous_day:n}'
-            variation_text_values.append(variation_text)
-    return *total_text_values, *variation_text_values,
+    cards = [state.country_world_cards[country_selected][field] for field in CARD_FIELDS['country_world']]
+    return *[card.text for card in cards], *[card.variation_text for card in cards]
 
 
 @app.callback([Output('total_confirmed_variation_world', 'style'),
@@ -733,30 +567,8 @@ def update_country_world_cards_text(country_selected):
                Output('total_deaths_variation_world', 'style'),
                ], [Input("dropdown_country_selected", "value")])
 def update_country_world_cards_color(country_selected):
-    field_list = ['Confirmed', 'Active_cases', 'Deaths']
-    color_cards_list = []
-    df_sub = df_country_world_data[df_country_world_data['Country'] == country_selected]
-    df = df_sub.copy()
-    for field in field_list:
-        if country_selected in constants.LIST_OF_WORLD_COUNTRIES_WITHOUT_DATA:
-            color = 'grey'
-            color_cards_list.append(color)
-        else:
-            card_value = df[field].iloc[-1]
-            card_value_previous_day = df[field].iloc[-2]
-            variation_previous_day = card_value - card_value_previous_day
-            if variation_previous_day <= 0 and field == 'Active_cases' or \
-                    variation_previous_day == 0 and field == 'Confirmed' or \
-                    variation_previous_day == 0 and field == 'Deaths':
-                color = 'limegreen'
-                color_cards_list.append(color)
-            else:
-                color = 'red'
-                color_cards_list.append(color)
-    dictionary_color = [{'color': color_cards_list[0]},
-                        {'color': color_cards_list[1]},
-                        {'color': color_cards_list[2]}]
-    return dictionary_color
+    cards = data_state.country_world_cards[country_selected]
+    return [{'color': cards[field].color} for field in CARD_FIELDS['country_world']]
 
 
 @app.callback([Output('administered_doses_text', 'children'),
@@ -767,15 +579,16 @@ def update_country_world_cards_color(country_selected):
                Output('herd_immunity_date', 'children'),
                ], [Input("i_news", "n_intervals")])
 def update_vaccines_italy_cards_text(self):
+    state = data_state
     log.info('Updating cards')
-    herd_immunity_date = load_resource('string_italy_herd_immunity') + calculate_date_of_herd_immunity()
-    last_df_data_update = get_last_df_data_update(df_vaccines_italy_summary_latest,
+    herd_immunity_date = load_resource('string_italy_herd_immunity') + calculate_date_of_herd_immunity(state)
+    last_df_data_update = get_last_df_data_update(state.df_vaccines_italy_summary_latest,
                                                   constants.DATE_PROPERTY_NAME_VACCINES_ITA_LAST_UPDATE)
     sub_header_vaccines_italy_text = load_resource('header_last_update_vaccines_italy') + last_df_data_update
     field_list = ['dosi_somministrate', 'dosi_consegnate', 'd2']
-    df_custom = pd.concat([df_vaccines_italy_summary_latest[field_list[0]],
-                           df_vaccines_italy_summary_latest[field_list[1]],
-                           df_vaccines_italy_registry_summary_latest[field_list[2]]], axis=1,
+    df_custom = pd.concat([state.df_vaccines_italy_summary_latest[field_list[0]],
+                           state.df_vaccines_italy_summary_latest[field_list[1]],
+                           state.df_vaccines_italy_registry_summary_latest[field_list[2]]], axis=1,
                           keys=[field_list[0], field_list[1], field_list[2]])
     df_custom = df_custom.fillna(0)
     total_text_values = []
@@ -794,7 +607,7 @@ def update_vaccines_italy_cards_text(self):
 @app.callback(Output('bar_chart_administrations_daily_total', 'figure'), [Input("i_news", "n_intervals")])
 def update_bar_chart_administrations_italy_daily_total(self):
     layout_administrations_by_day = copy.deepcopy(layout)
-    df_by_day = df_vaccines_italy_daily_summary_latest_grouped_by_ITA
+    df_by_day = data_state.df_vaccines_italy_daily_summary_latest_grouped_by_ITA
     # by convention, we exclude the data of last day, which could be partial
     # we use head funct 'cause is  about 6 times fasting than drop func
     df_by_day = df_by_day.head(-1)
@@ -839,7 +652,7 @@ def update_bar_chart_administrations_italy_daily_total(self):
               [Input("radio_buttons_italian_vaccines_data", "value")])
 def update_bar_chart_vaccines_italy_administrations_by_age(data_selected):
     layout_administrations_by_age = copy.deepcopy(layout)
-    df = df_vaccines_italy_registry_summary_latest
+    df = data_state.df_vaccines_italy_registry_summary_latest
 
     bar_total = create_data_dict_for_bar(type_graph="bar", data_x=df["eta"], data_y=df["totale"],
                                          name=load_resource('administrations_by_age'),
@@ -899,18 +712,15 @@ def create_data_dict_for_bar(type_graph="", data_x=None, data_y=None, color=None
 @app.callback(Output('bar_chart_daily_administrations', 'figure'),
               [Input('radio_buttons_italian_vaccines_daily_administrations', 'value')])
 def update_bar_chart_vaccines_italy_daily_administrations(data_selected):
+    state = data_state
     layout_administrations_by_day = copy.deepcopy(layout)
-    df_by_day_ita = df_vaccines_italy_admin_summary_latest_grouped_by_ITA
-    df_ita_admin = df_vaccines_italy_administration.groupby('forn').sum()
-    df = df_vaccines_italy_summary_latest.copy()
+    df_by_day_ita = state.df_vaccines_italy_admin_summary_latest_grouped_by_ITA
+    df_ita_admin = state.df_vaccines_italy_administrations_by_supplier
+    df = state.df_vaccines_italy_summary_latest.copy()
     df['dosi_consegnate'] = df['dosi_consegnate'].apply(format_value_string_to_locale)
     df['dosi_somministrate'] = df['dosi_somministrate'].apply(format_value_string_to_locale)
     df = df.sort_values(by=['percentuale_somministrazione'], ascending=False)
     df['percentuale_somministrazione'] = df['percentuale_somministrazione'].apply(format_value_string_to_locale)
-    df_ita_admin.reset_index(inplace=True)
-    df_ita_admin['total_administrations'] = df_ita_admin["d1"] + \
-                                            df_ita_admin["d2"] + \
-                                            df_ita_admin["db1"]
 
     scatter_total_admin = create_data_dict_for_bar(type_graph="scatter", data_x=df_by_day_ita["data"],
                                                    data_y=df_by_day_ita["total_on_today"],
@@ -988,19 +798,20 @@ def update_bar_chart_vaccines_italy_daily_administrations(data_selected):
 @app.callback(Output('mainContainer', 'children'),
               [Input('dropdown_language_selected', 'value')])
 def update_language(language):
+    state = data_state
     if language == locale_language.language:
         # Check required otherwise during startup the page is loaded twice
         log.info("Preventing language update since no language changes was detected")
         raise PreventUpdate
     locale_language.language = language
     log.info(f"User switching language to: {language}")
-    return create_page_components(app, df_regional_data, df_country_world_data)
+    return create_page_components(app, state.df_regional_data, state.df_country_world_data)
 
 
 @app.callback(Output("last_check_update_text", "children"), [Input("i_news", "n_intervals")])
 def update_last_data_check(self):
     log.info('Updating last data check')
-    string_last_data_check = load_resource('label_last_check_update') + last_check_for_update + ' CET'
+    string_last_data_check = load_resource('label_last_check_update') + data_state.last_check_for_update + ' CET'
     return string_last_data_check
 
 
@@ -1015,192 +826,13 @@ def update_last_data_check(self):
     return string_last_data_check
 
 
-# Merge data of P.A Bolzano and P.A. Trento (in Trentino Alto Adige region, with 'codice_regione' = 4) to match
-# GeoJson structure
-def adjust_region(df_sb):
-    trento_row = df_sb.loc[df_sb['codice_regione'] == 22].squeeze()
-    bolzano_row = df_sb.loc[df_sb['codice_regione'] == 21].squeeze()
-    trentino_row = trento_row
-    df_sb.reindex(list(range(0, 21)))
-    for field in field_list_to_rate_italian_regions:
-        trento_value = trento_row.get(field)
-        bolzano_value = bolzano_row.get(field)
-        trentino_row.at[field] = trento_value + bolzano_value
-    df_sb.drop([trento_row.name, bolzano_row.name], inplace=True)
-    trentino_row.at['codice_regione'] = 4
-    trentino_row.at['denominazione_regione'] = 'Trentino-Alto Adige'
-    df_sb = df_sb.append(trentino_row)
-    return df_sb
-
-
-def load_country_world_rate_data_frame(df):
-    # We create a copy of the original DataFrame to avoid working on the original DataFrame and to suppress warning
-    df_sb = df.copy()
-    df_sb = df_sb.sort_values(by=[constants.DATE_PROPERTY_NAME_EN])
-    df_sb = df_sb.tail(constants.NUMBER_OF_WORLD_COUNTRIES + len(constants.LIST_OF_WORLD_COUNTRIES_WITHOUT_DATA))
-    df_sb.sort_values(by=['Country'], inplace=True)
-    df_sb['Population'] = ''
-    for index, row in df_sb.iterrows():
-        nation_name = row["Country"]
-        if nation_name not in world_population:
-            continue
-        population = int(world_population[nation_name])
-        df_sb.at[index, 'Population'] = population
-        for field in constants.LIST_OF_WORLD_FIELDS_TO_RATE:
-            value = row[field]
-            pressure_value = (value / population) * constants.INHABITANT_RATE
-            df_sb.at[index, field] = round(pressure_value, 2)
-    return df_sb
-
-
-def load_region_rate_data_frame(df):
-    # We create a copy of the original DataFrame to avoid working on the original DataFrame and to suppress warning
-    df_sb = df.copy()
-    df_sb = df_sb.tail(21)
-    df_sb = adjust_region(df_sb)
-    df_sb['population'] = list(italy_regional_population.values())
-    # Convert field to float
-    for field in field_list_to_rate_italian_regions:
-        df_sb[field] = pd.to_numeric(df_sb[field], downcast='float')
-    for i, row in df_sb.iterrows():
-        population = row['population']
-        for field in field_list_to_rate_italian_regions:
-            value = row[field]
-            pressure_value = (float(value) / float(population)) * constants.INHABITANT_RATE
-            df_sb.at[i, field] = round(pressure_value, 2)
-    return df_sb
-
-
-def load_region_available_icu(df_sb):
-    df_sb['available_ICU'] = ''
-    for index, row in df_sb.iterrows():
-        region_name = row["denominazione_regione"]
-        if region_name not in italy_ICU:
-            continue
-        available_icu = int(italy_ICU[region_name])
-        df_sb.at[index, 'available_ICU'] = available_icu
-    return df_sb
-
-
-def adjust_df_world_to_geojson(df):
-    df['Country'] = df['Country'].replace(['US', 'Congo (Kinshasa)', 'Congo (Brazzaville)', 'Korea, South',
-                                           'Cote d\'Ivoire', 'Czechia', 'Serbia', 'Taiwan*', 'Tanzania',
-                                           'North Macedonia'],
-                                          ['United States of America', 'Democratic Republic of the Congo',
-                                           'Republic of Congo', 'South Korea',
-                                           'Ivory Coast', 'Czech Republic', 'Republic of Serbia', 'Taiwan',
-                                           'United Republic of Tanzania', 'Macedonia']
-                                          )
-    return df
-
-
-# for adding country not included in the df_country world source
-# useful for mapping countries with geojson data
-def add_excluded_country_world(df):
-    last_date_df = df.iloc[-1][constants.DATE_PROPERTY_NAME_EN]
-    list_of_row = []
-    for country_without_data in constants.LIST_OF_WORLD_COUNTRIES_WITHOUT_DATA:
-        list_of_row.append({'Date': last_date_df,
-                            'Country': country_without_data,
-                            'Confirmed': 0,
-                            'Deaths': 0,
-                            'Active_cases': 0
-                            })
-
-    for row in list_of_row:
-        df = df.append(row, ignore_index=True)
-    return df
-
-
-def get_content_length(url):
-    resp = requests.head(url)
-    if resp.status_code != 200:
-        log.error(f"Request failed trying to contact URL: {url}")
-        return -1
-    size = resp.headers["Content-Length"]
-    return size
-
-
-def get_last_data_check():
-    last_check_update = datetime.datetime.now(pytz.timezone('Europe/Rome')).strftime(" %d/%m/%Y %H:%M:%S")
-    return last_check_update
-
-
 def get_last_df_data_update(df, date_property_name):
     string_date_update = (df[date_property_name].iloc[-1]).strftime(" %d/%m/%Y")
     return string_date_update
 
 
-def add_variation_new_swabs_column_df_italy(df):
-    df['nuovi_tamponi'] = 0
-    previous_row = pd.Series
-    for index, row in df.iterrows():
-        if index == 0:
-            previous_row = row
-        else:
-            variation_value = row['tamponi'] - previous_row['tamponi']
-            df.at[index, "nuovi_tamponi"] = variation_value
-            previous_row = row
-    return df
-
-
-def add_variation_columns_for_world_aggregate_data(df):
-    df['New Confirmed'], df['New Deaths'] = [0, 0]
-    for index, row in df.iterrows():
-        for col in df.columns:
-            if col in ('Confirmed', 'Deaths') and (index != 0):
-                df.at[index, f"New {col}"] = row[col] - df.loc[index - 1, f"{col}"]
-    return df
-
-
-def add_variation_columns_for_world_countries(df):
-    df['New Confirmed'], df['New Deaths'] = [0.0, 0.0]
-    country = ""
-    previous_row = ""
-    for index, row in df.iterrows():
-        if (index == 0) or country != row['Country']:
-            country = row['Country']
-            previous_row = row
-        else:
-            for col in df.columns:
-                if col in ('Confirmed', 'Deaths'):
-                    variation_value = row[col] - previous_row[col]
-                    df.at[index, f"New {col}"] = variation_value
-            previous_row = row
-    return df
-
-
-def add_total_on_day_administrations_vaccines_italy(df):
-    df['total_on_today'] = 0
-    df = df.groupby('data').sum()
-    df.reset_index(inplace=True)
-    df['total_on_today'] = df['totale'].cumsum()
-    return df
-
-
-def add_daily_administrations_italy(df):
-    df['administrated_people'] = 0
-    df = df.groupby('data').sum()
-    df.reset_index(inplace=True)
-    df['administrated_people'] = df['d1'].cumsum() + df['d2'].cumsum() + df[
-        'dpi'].cumsum()
-    # we need to consider only the audience of people actually immunized
-    df['remaining_administrations'] = df['d2'].cumsum() + df['dpi'].cumsum()
-    previous_row = pd.Series
-    for index, row in df.iterrows():
-        if index == 0:
-            previous_row = row
-        else:
-            variation_value = row['administrated_people'] - previous_row['administrated_people']
-            df.at[index, "totale"] = variation_value
-            previous_row = row
-    # df.drop(df[df.d2 == 0].index, inplace=True)
-    df['mov_avg'] = round(df.totale.rolling(window=7, min_periods=1).mean(), 0)
-    return df
-
-
-def calculate_date_of_herd_immunity():
-    df = df_vaccines_italy_daily_summary_latest_grouped_by_ITA
+def calculate_date_of_herd_immunity(state):
+    df = state.df_vaccines_italy_daily_summary_latest_grouped_by_ITA
     df = df.head(-1)
     pd.set_option("display.max_rows", None, "display.max_columns", None)
     first_useful_date = df['data'].iloc[-1]
@@ -1213,192 +845,82 @@ def calculate_date_of_herd_immunity():
     return date_herd_immunity
 
 
-def add_percentage_vaccination_italy_phases(df):
-    df['percentage_vaccinated_population'] = 0
-    df = df.groupby('data').sum()
-    df.reset_index(inplace=True)
-    df['percentage_vaccinated_population'] = round(((df['d2'] + df['dpi'])
-                                                    / constants.VACCINABLE_ITALIAN_POPULATION) * 100, 2)
-    df['percentage_vaccinated_population'] = df['percentage_vaccinated_population'].cumsum()
-    return df
-
-
-def load_data_from_web():
-    log.info('Start scheduled task to check data updates')
-
-    load_worldwide_aggregate_data()
-    load_country_world_data()
-    load_national_data()
-    load_regional_data()
-    load_vaccines_italy_data()
-
-    global last_check_for_update
-    last_check_for_update = get_last_data_check()
-    log.info(f'Update task completed at: {last_check_for_update}')
-
-
-def load_regional_data():
-    global df_regional_data, df_rate_regional, last_update_content_regional_data
-    # Check if updates for Regional data is required
-    current_update_content_regional_data = int(get_content_length(constants.URL_CSV_REGIONAL_DATA))
-    if current_update_content_regional_data == -1:
-        log.info("Provider's server for Regional Data is unresponsive, retrying later")
-    elif current_update_content_regional_data != last_update_content_regional_data or df_rate_regional is None:
-        log.info('Regional data update required')
-        df_regional_data = load_csv(constants.URL_CSV_REGIONAL_DATA, constants.DATE_PROPERTY_NAME_IT)
-        df_regional_data = load_region_available_icu(df_regional_data)
-        df_regional_data['available_ICU'] = pd.to_numeric(df_regional_data['available_ICU'], downcast='float')
-        df_regional_data['pressure_ICU'] = round(((df_regional_data['terapia_intensiva'] /
-                                                   df_regional_data['available_ICU']) * 100), 2)
-        df_rate_regional = load_region_rate_data_frame(df_regional_data)
-        log.info(f"Old Content-length: {last_update_content_regional_data} bytes")
-        log.info(f"New Content-length: {current_update_content_regional_data} bytes")
-        last_update_content_regional_data = current_update_content_regional_data
-    else:
-        log.info('No updates required for Regional data')
-
-
-def load_national_data():
-    global df_national_data, last_update_content_national_data
-    # Check if updates for National data is required
-    current_update_content_national_data = int(get_content_length(constants.URL_CSV_ITALY_DATA))
-    if current_update_content_national_data == -1:
-        log.info("Provider's server for National data is unresponsive, retrying later")
-    elif current_update_content_national_data != last_update_content_national_data:
-        log.info('National data update required')
-        df_national_data = load_csv(constants.URL_CSV_ITALY_DATA, constants.DATE_PROPERTY_NAME_IT)
-        df_national_data = add_variation_new_swabs_column_df_italy(df_national_data)
-        df_national_data['ratio_n_pos_tamponi'] = round(((df_national_data['nuovi_positivi'] /
-                                                          df_national_data['nuovi_tamponi']) * 100), 2)
-        df_national_data['pressure_ICU'] = round(((df_national_data['terapia_intensiva'] /
-                                                   constants.TOTAL_ICU_ITALY) * 100), 2)
-        log.info(f"Old Content-length: {last_update_content_national_data} bytes")
-        log.info(f"New Content-length: {current_update_content_national_data} bytes")
-        send_one_signal_notification_for_dataframe_update('notification_text_repo_pandemic_data_ita_updated',
-                                                          'Italy data update',
-                                                          last_update_content_national_data)
-        last_update_content_national_data = current_update_content_national_data
+def publish_data_state(new_state):
+    # A single reference swap: callbacks see either the previous state or the new one, never a mix of the two
+    global data_state
+    data_state = new_state
 
-    else:
-        log.info('No updates required for National data')
-
-
-def load_country_world_data():
-    global df_country_world_data, df_rate_country_world, last_update_content_country_world_data
-    # Check if updates for World data is required
-    current_update_content_country_world_data = int(get_content_length(constants.URL_CSV_WORLD_COUNTRIES_DATA))
-    if current_update_content_country_world_data == -1:
-        log.info("Provider's server for Country World data is unresponsive, retrying later")
-    elif current_update_content_country_world_data != last_update_content_country_world_data:
-        log.info('Country World data update required')
-        df_country_world_data = load_csv(constants.URL_CSV_WORLD_COUNTRIES_DATA, constants.DATE_PROPERTY_NAME_EN)
-        df_country_world_data['Active_cases'] = df_country_world_data['Confirmed'] - df_country_world_data['Deaths']
-        df_country_world_data = adjust_df_world_to_geojson(df_country_world_data)
-        df_country_world_data = add_excluded_country_world(df_country_world_data)
-        df_country_world_data = add_variation_columns_for_world_countries(df_country_world_data)
-        df_rate_country_world = load_country_world_rate_data_frame(df_country_world_data)
-        log.info(f"Old Content-length: {last_update_content_country_world_data} bytes")
-        log.info(f"New Content-length: {current_update_content_country_world_data} bytes")
-        send_one_signal_notification_for_dataframe_update('notification_text_repo_pandemic_data_world_updated',
-                                                          'World data update',
-                                                          last_update_content_country_world_data)
-        last_update_content_country_world_data = current_update_content_country_world_data
-    else:
-        log.info('No updates required for Country World data')
-
-
-def load_worldwide_aggregate_data():
-    global df_worldwide_aggregate_data, last_update_content_worldwide_aggregate_data
-    # Check if updates for Worldwide Aggregate data is required
-    current_update_content_worldwide_aggregate_data = int(
-        get_content_length(constants.URL_CSV_WORLDWIDE_AGGREGATE_DATA))
-    if current_update_content_worldwide_aggregate_data == -1:
-        log.info("Provider's server for Worldwide Aggregate data is unresponsive, retrying later")
-    elif current_update_content_worldwide_aggregate_data != last_update_content_worldwide_aggregate_data:
-        log.info('Worldwide Aggregate data update required')
-        df_worldwide_aggregate_data = load_csv(constants.URL_CSV_WORLDWIDE_AGGREGATE_DATA,
-                                               constants.DATE_PROPERTY_NAME_EN)
-        df_worldwide_aggregate_data['Active_cases'] = df_worldwide_aggregate_data['Confirmed'] - \
-                                                      df_worldwide_aggregate_data['Deaths']
-        df_worldwide_aggregate_data = add_variation_columns_for_world_aggregate_data(df_worldwide_aggregate_data)
-        log.info(f"Old Content-length: {last_update_content_worldwide_aggregate_data} bytes")
-        log.info(f"New Content-length: {current_update_content_worldwide_aggregate_data} bytes")
-        last_update_content_worldwide_aggregate_data = current_update_content_worldwide_aggregate_data
-    else:
-        log.info('No updates required for Worldwide Aggregate data')
-
-
-def load_vaccines_italy_data():
-    global df_vaccines_italy_summary_latest, last_update_content_vaccines_italy_data, \
-        df_vaccines_italy_registry_summary_latest, df_vaccines_italy_admin_summary_latest, \
-        df_vaccines_italy_administration_point, df_vaccines_italy_admin_summary_latest_grouped_by_ITA, \
-        df_vaccines_italy_daily_summary_latest_grouped_by_ITA, df_vaccines_italy_administration
-    # Check if updates for National data is required
-    current_update_content_vaccines_italy_data = int(get_content_length(constants.URL_VACCINES_ITA_SUMMARY_LATEST))
-    if current_update_content_vaccines_italy_data == -1:
-        log.info("Provider's server for Italian Vaccines data is unresponsive, retrying later")
-    elif current_update_content_vaccines_italy_data != last_update_content_vaccines_italy_data:
-        log.info('Italian Vaccines data update required')
-        df_vaccines_italy_summary_latest = load_csv(constants.URL_VACCINES_ITA_SUMMARY_LATEST,
-                                                    constants.DATE_PROPERTY_NAME_VACCINES_ITA_LAST_UPDATE)
-        df_vaccines_italy_registry_summary_latest = load_csv(constants.URL_VACCINES_ITA_REGISTRY_SUMMARY_LATEST,
-                                                             constants.DATE_PROPERTY_NAME_VACCINES_ITA_LAST_UPDATE)
-        df_vaccines_italy_admin_summary_latest = \
-            load_csv(constants.URL_VACCINES_ITA_ADMINISTRATIONS_SUMMARY_LATEST, "data")
-        df_vaccines_italy_administration = \
-            load_csv(constants.URL_VACCINES_ITA_ADMINISTRATIONS, "data")
-        df_vaccines_italy_admin_summary_latest_grouped_by_ITA = \
-            add_total_on_day_administrations_vaccines_italy(df_vaccines_italy_admin_summary_latest)
-        df_vaccines_italy_daily_summary_latest_grouped_by_ITA = \
-            add_daily_administrations_italy(df_vaccines_italy_admin_summary_latest)
-        df_vaccines_italy_administration_point = load_csv(constants.URL_VACCINES_ITA_ADMINISTRATION_POINT)
-        log.info(f"Old Content-length: {last_update_content_vaccines_italy_data} bytes")
-        log.info(f"New Content-length: {current_update_content_vaccines_italy_data} bytes")
-        send_one_signal_notification_for_dataframe_update('notification_text_repo_vaccines_data_ita_updated',
-                                                          'Vaccine data update',
-                                                          last_update_content_vaccines_italy_data)
-        last_update_content_vaccines_italy_data = current_update_content_vaccines_italy_data
 
-    else:
-        log.info('No updates required for Italian Vaccines data')
+def load_data_from_snapshot(name=None):
+    """Publish the data state of a snapshot, by default the one currently published. Return False if not available"""
+    global data_snapshot_name
+    snapshot = load_data_state_from_snapshot(name)
+    if snapshot is None:
+        return False
+    data_snapshot_name, state = snapshot
+    publish_data_state(state)
+    log.info(f'Data version {state.version} loaded from snapshot {data_snapshot_name}')
+    return True
 
 
-def app_layout():
-    app.layout = html.Div(
-        children=create_page_components(app, df_regional_data, df_country_world_data),
-        id="mainContainer",
-        style={"display": "flex", "flex-direction": "column"},
-    )
+def start_data_loader():
+    """Make this process, once elected leader, the data loader checking the data sources on schedule"""
+    log.info('This process is the data loader')
+    is_loaded_from_snapshot = data_ingest.load_at_boot()
+    # Scheduled only once the data are loaded, the refresh of the sources due builds on them
+    schedule_jobs(data_ingest)
+    if is_loaded_from_snapshot:
+        # The snapshot could be outdated, the sources are checked again without blocking the boot
+        log.info('Data loaded from snapshot, starting revalidation of the data sources')
+        revalidation_thread = Thread(name="revalidation-thread", target=data_ingest.refresh)
+        revalidation_thread.start()
 
 
-def send_daily_italian_notification():
-    new_positives = df_national_data['nuovi_positivi'].iloc[-1]
-    date_string = df_national_data.iloc[-1]['data'].strftime('%d/%m/%Y')
-    # We are assuming the dataset is updated every day, we could check or add the last date in the message
-    send_one_signal_notification("notification_text_daily_italian_update", "Italy daily update", date_string,
-                                 new_positives)
+def follow_data_snapshots():
+    """Load every new snapshot published by the data loader, until this process is elected to replace it"""
+    while True:
+        time.sleep(constants.SNAPSHOT_POLL_SECONDS)
+        if data_loader_enabled and leader_election.acquire():
+            start_data_loader()
+            return
+        name = read_current_snapshot_name()
+        if name is not None and name != data_snapshot_name:
+            load_data_from_snapshot(name)
 
 
-schedule.every(30).minutes.do(load_data_from_web)
-schedule.every().day.at("08:15").do(load_data_from_web)
-schedule.every().day.at("18:05").do(load_data_from_web)
-schedule.every().day.at("21:00").do(send_daily_italian_notification)
+def load_data_at_boot():
+    while not (data_loader_enabled and leader_election.acquire()):
+        if load_data_from_snapshot():
+            snapshot_thread = Thread(name="snapshot-thread", target=follow_data_snapshots, daemon=True)
+            snapshot_thread.start()
+            return
+        log.info('Waiting for the data loader to publish a data snapshot')
+        time.sleep(constants.SNAPSHOT_POLL_SECONDS)
+    start_data_loader()
 
 
-def run_schedule():
-    while True:
-        schedule.run_pending()
-        time.sleep(10)
+# Only the data loader checks the data sources and sends the daily notification, once for all the processes.
+# The pandas work of the refresh runs in a child process by default, so that it does not slow down the requests
+data_ingest = DataIngest(serve_data=True, on_publish=publish_data_state,
+                         use_subprocess=is_refresh_in_subprocess_enabled())
+
+
+def app_layout():
+    state = data_state
+    app.layout = html.Div(
+        children=create_page_components(app, state.df_regional_data, state.df_country_world_data),
+        id="mainContainer",
+        style={"display": "flex", "flex-direction": "column"},
+    )
 
 
 def initialize_thread():
-    log.info('Starting schedule thread')
-    schedule_thread = Thread(name="scheduled2-thread", target=run_schedule)
-    schedule_thread.start()
+    log.info('Starting scheduler thread')
+    scheduler.start()
 
 
 initialize_thread()
-load_data_from_web()
+load_data_at_boot()
 app.config.suppress_callback_exceptions = True
 # Create callbacks
 app.clientside_callback(
@@ -1437,6 +959,22 @@ def test_notify():
     return "Notification sent", 200
 
 
+@server.route('/metrics/http', methods=['GET'])
+def http_metrics():
+    return jsonify(http_client.get_metrics())
+
+
+@server.route('/metrics/jobs', methods=['GET'])
+def jobs_metrics():
+    # Jobs scheduled in this process, only the data loader has some
+    return jsonify(scheduler.get_status())
+
+
+@server.route('/metrics/polling', methods=['GET'])
+def polling_metrics():
+    return jsonify(source_polling.get_status())
+
+
 # Redirect all the traffic to HTTPS if the server is not running in debug mode. Check 'DEBUG_MODE' env var for this.
 Talisman(server, content_security_policy=None)
 
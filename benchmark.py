@@ -0,0 +1,290 @@
+import argparse
+import datetime
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+import constants
+from data_cube import DataCube
+from reference_data import ReferenceTable
+from source_polling import FetchLog, SourcePolling, source_polling
+from data_pipeline import add_variation_columns_for_world_countries, add_variation_columns_for_world_aggregate_data, \
+    calculate_rates
+
+""" Benchmarks of the data preparation on synthetic data of the same shape of the real sources.
+Run with: python benchmark.py --scales 1 10
+Scale 1 is the size of today's sources, the loops replaced are timed up to --legacy-max-rows rows and estimated above
+"""
+
+NUMBER_OF_DAYS = 1000
+
+
+def create_country_world_data(scale):
+    # Cumulative values per country, with some days missing and some downward corrections as in the real source
+    random_generator = np.random.default_rng(0)
+    number_of_countries = constants.NUMBER_OF_WORLD_COUNTRIES * scale
+    countries = np.repeat([f"Country {i:05d}" for i in range(number_of_countries)], NUMBER_OF_DAYS)
+    dates = np.tile(pd.date_range('2020-01-22', periods=NUMBER_OF_DAYS), number_of_countries)
+    df = pd.DataFrame({'Date': dates, 'Country': countries})
+    for column in ('Confirmed', 'Deaths'):
+        daily_values = random_generator.integers(-5, 1000, size=len(df))
+        df[column] = pd.Series(daily_values).groupby(df['Country']).cumsum().clip(lower=0).astype('int32')
+    df = df.drop(df.sample(frac=0.01, random_state=0).index).reset_index(drop=True)
+    df['Active_cases'] = df['Confirmed'] - df['Deaths']
+    return df
+
+
+def legacy_add_variation_columns_for_world_countries(df):
+    df['New Confirmed'], df['New Deaths'] = [0.0, 0.0]
+    country = ""
+    previous_row = ""
+    for index, row in df.iterrows():
+        if (index == 0) or country != row['Country']:
+            country = row['Country']
+            previous_row = row
+        else:
+            for col in df.columns:
+                if col in ('Confirmed', 'Deaths'):
+                    variation_value = row[col] - previous_row[col]
+                    df.at[index, f"New {col}"] = variation_value
+            previous_row = row
+    return df
+
+
+def create_worldwide_aggregate_data(scale):
+    # The series of all the countries one after the other, as a single series with downward corrections
+    df = create_country_world_data(scale)[['Date', 'Confirmed', 'Deaths']]
+    df[['Confirmed', 'Deaths']] = df[['Confirmed', 'Deaths']].astype('int64').cumsum()
+    return df
+
+
+def legacy_add_variation_columns_for_world_aggregate_data(df):
+    df['New Confirmed'], df['New Deaths'] = [0, 0]
+    for index, row in df.iterrows():
+        for col in df.columns:
+            if col in ('Confirmed', 'Deaths') and (index != 0):
+                df.at[index, f"New {col}"] = row[col] - df.loc[index - 1, f"{col}"]
+    return df
+
+
+def create_country_world_rate_data(scale):
+    return add_variation_columns_for_world_countries(create_country_world_data(scale))
+
+
+def create_population(number_of_countries):
+    countries = [f"Country {i:05d}" for i in range(number_of_countries)]
+    population = np.random.default_rng(0).integers(10 ** 4, 10 ** 9, size=number_of_countries)
+    return ReferenceTable('synthetic_world_population', pd.DataFrame({'country': countries, 'population': population}),
+                          'country', 'population')
+
+
+# Created once, so that building them is not part of the timings. The legacy code read populations as strings
+synthetic_world_population = create_population(constants.NUMBER_OF_WORLD_COUNTRIES * 100)
+legacy_synthetic_world_population = {country: str(population)
+                                     for country, population in synthetic_world_population.values.items()}
+
+
+def legacy_load_country_world_rate_data_frame(df, world_population):
+    df_sb = df.copy()
+    df_sb = df_sb.sort_values(by=[constants.DATE_PROPERTY_NAME_EN])
+    df_sb = df_sb.tail(constants.NUMBER_OF_WORLD_COUNTRIES + len(constants.LIST_OF_WORLD_COUNTRIES_WITHOUT_DATA))
+    df_sb.sort_values(by=['Country'], inplace=True)
+    df_sb['Population'] = ''
+    for index, row in df_sb.iterrows():
+        nation_name = row["Country"]
+        if nation_name not in world_population:
+            continue
+        population = int(world_population[nation_name])
+        df_sb.at[index, 'Population'] = population
+        for field in constants.LIST_OF_WORLD_FIELDS_TO_RATE:
+            value = row[field]
+            pressure_value = (value / population) * constants.INHABITANT_RATE
+            df_sb.at[index, field] = round(pressure_value, 2)
+    return df_sb
+
+
+def calculate_country_world_rates(df):
+    return calculate_rates(df, 'Country', synthetic_world_population, list(constants.LIST_OF_WORLD_FIELDS_TO_RATE),
+                           'Population', constants.DATE_PROPERTY_NAME_EN)
+
+
+def legacy_calculate_country_world_rates(df):
+    return legacy_load_country_world_rate_data_frame(df, legacy_synthetic_world_population)
+
+
+def check_same_frames(result, legacy_result):
+    pd.testing.assert_frame_equal(result, legacy_result, check_dtype=False)
+
+
+def check_same_rates_of_last_rows(result, legacy_result):
+    # The loops only rated the rows of the last day, the engine rates the whole history
+    fields = list(constants.LIST_OF_WORLD_FIELDS_TO_RATE)
+    pd.testing.assert_frame_equal(result.loc[legacy_result.index, fields], legacy_result[fields], check_dtype=False)
+
+
+def time_function(function, df):
+    df = df.copy()
+    start_time = time.perf_counter()
+    result = function(df)
+    return time.perf_counter() - start_time, result
+
+
+def benchmark(name, create_data_function, function, legacy_function, scales, legacy_max_rows=None,
+              check_function=check_same_frames):
+    """Time function against the legacy_function it replaces. Legacy functions slower than linear are never skipped"""
+    legacy_seconds_per_row = None
+    for scale in scales:
+        df = create_data_function(scale)
+        seconds, result = time_function(function, df)
+        if legacy_max_rows is None or len(df) <= legacy_max_rows:
+            legacy_seconds, legacy_result = time_function(legacy_function, df)
+            legacy_seconds_per_row = legacy_seconds / len(df)
+            check_function(result, legacy_result)
+            legacy_label = f"{legacy_seconds:.2f}s"
+        elif legacy_seconds_per_row is not None:
+            legacy_seconds = legacy_seconds_per_row * len(df)
+            legacy_label = f"~{legacy_seconds:.2f}s (estimated)"
+        else:
+            legacy_seconds = None
+            legacy_label = "not run"
+        speed_up = f"{legacy_seconds / seconds:.0f}x" if legacy_seconds else "-"
+        print(f"{name} | scale {scale} | {len(df)} rows | before: {legacy_label} | after: {seconds:.3f}s | "
+              f"speed-up: {speed_up}")
+
+
+def benchmark_series_lookup(scales, number_of_lookups=100):
+    """Time of reading the series of a country as done by the callbacks, from the DataFrame and from the cube"""
+    for scale in scales:
+        df = create_country_world_data(scale)
+        data_cube = DataCube(df, 'Country', constants.DATE_PROPERTY_NAME_EN)
+        countries = df['Country'].unique()[:number_of_lookups]
+        start_time = time.perf_counter()
+        for country in countries:
+            df[df['Country'] == country]['Confirmed'].tolist()
+        legacy_seconds = (time.perf_counter() - start_time) / len(countries)
+        start_time = time.perf_counter()
+        for country in countries:
+            data_cube.get_series('Confirmed', country).tolist()
+        seconds = (time.perf_counter() - start_time) / len(countries)
+        print(f"Country series lookup | scale {scale} | {len(df)} rows | before: {legacy_seconds * 1000:.2f}ms | "
+              f"after: {seconds * 1000:.3f}ms | speed-up: {legacy_seconds / seconds:.0f}x")
+
+
+def refresh_synthetic_data(scale):
+    # Same kind of pandas work of a data refresh
+    df = add_variation_columns_for_world_countries(create_country_world_data(scale))
+    calculate_country_world_rates(df)
+    DataCube(df, 'Country', constants.DATE_PROPERTY_NAME_EN)
+
+
+def measure_callback_latencies(data_cube, countries, refresh_is_running):
+    """Latencies of series lookups as done by the callbacks, one requested every millisecond while the refresh runs.
+    A latency starts when the lookup is requested, so it includes the time waiting for the GIL"""
+    latencies = []
+    request_time = time.perf_counter()
+    while refresh_is_running() or not latencies:
+        for country in countries:
+            request_time += 0.001
+            time.sleep(max(request_time - time.perf_counter(), 0))
+            data_cube.get_series('Confirmed', country).tolist()
+            latencies.append(time.perf_counter() - request_time)
+            # Requests not served in time are not queued, the next one is requested a millisecond later
+            request_time = max(request_time, time.perf_counter() - 0.001)
+    return np.array(latencies) * 1000
+
+
+def benchmark_callback_latency_during_refresh(scales):
+    """Latency of the callbacks while a refresh runs in a thread of the web process and in a child process"""
+    for scale in scales:
+        df = create_country_world_data(1)
+        data_cube = DataCube(df, 'Country', constants.DATE_PROPERTY_NAME_EN)
+        countries = df['Country'].unique()[:20]
+        refresh_thread = threading.Thread(target=refresh_synthetic_data, args=(scale,))
+        refresh_thread.start()
+        thread_latencies = measure_callback_latencies(data_cube, countries, refresh_thread.is_alive)
+        # Spawned as the web application does, the time to start the child process is part of the refresh
+        refresh_process = multiprocessing.get_context('spawn').Process(target=refresh_synthetic_data, args=(scale,))
+        refresh_process.start()
+        subprocess_latencies = measure_callback_latencies(data_cube, countries, refresh_process.is_alive)
+        refresh_process.join()
+        print(f"Callback latency during a refresh | scale {scale} | "
+              f"before (thread): p50 {np.percentile(thread_latencies, 50):.2f}ms, "
+              f"p99 {np.percentile(thread_latencies, 99):.2f}ms | "
+              f"after (subprocess): p50 {np.percentile(subprocess_latencies, 50):.2f}ms, "
+              f"p99 {np.percentile(subprocess_latencies, 99):.2f}ms")
+
+
+def create_publication_times(number_of_days, timezone):
+    # Published once a day at about 17:00, as the Italian data
+    random_generator = np.random.default_rng(0)
+    first_day = datetime.date(2021, 3, 1)
+    return np.array([timezone.localize(datetime.datetime.combine(first_day + datetime.timedelta(days=day),
+                                                                 datetime.time(17))).timestamp()
+                     + random_generator.normal(0, 20 * 60) for day in range(number_of_days)])
+
+
+def simulate_polling(publication_times, get_next_check_time, measured_from):
+    """Checks of a source published at publication_times. Return the checks and the delays of the data updates,
+    after measured_from"""
+    checks = 0
+    delays = []
+    check_time = previous_check_time = float(publication_times[0] - 86400)
+    while check_time < publication_times[-1] + 3600:
+        published = int(np.searchsorted(publication_times, check_time))
+        if check_time >= measured_from:
+            checks += 1
+            if published and publication_times[published - 1] > previous_check_time:
+                delays.append(check_time - publication_times[published - 1])
+        previous_check_time = check_time
+        check_time = get_next_check_time(check_time, published)
+    return checks, np.array(delays) / 60
+
+
+def benchmark_adaptive_polling(number_of_days=42):
+    """Checks of a source and delays of its updates with a fixed cadence and with the adaptive polling"""
+    publication_times = create_publication_times(number_of_days, source_polling.timezone)
+    # The first two weeks are needed to learn the publication window
+    measured_from = publication_times[14] - 12 * 3600
+    measured_days = number_of_days - 14
+    with tempfile.TemporaryDirectory() as directory:
+        polling = SourcePolling(['source'], FetchLog(os.path.join(directory, 'fetch_log.jsonl')),
+                                source_polling.timezone)
+
+        def get_adaptive_next_check_time(check_time, version):
+            polling.fetch_log.record({'source': SimpleNamespace(version=version)}, check_time)
+            return max(polling.get_next_check_time('source'), check_time + 1)
+
+        results = {'fixed (30 minutes)': simulate_polling(publication_times,
+                                                          lambda check_time, version: check_time + 1800,
+                                                          measured_from),
+                   'adaptive': simulate_polling(publication_times, get_adaptive_next_check_time, measured_from)}
+    for name, (checks, delays) in results.items():
+        print(f"Polling of a daily source | {name} | {checks / measured_days:.1f} checks per day | "
+              f"delay of the updates: average {delays.mean():.1f} minutes, max {delays.max():.1f} minutes")
+
+
+def run_benchmarks():
+    parser = argparse.ArgumentParser(description="Benchmarks of the data preparation")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--legacy-max-rows', type=int, default=500000)
+    args = parser.parse_args()
+    benchmark('World countries variations', create_country_world_data, add_variation_columns_for_world_countries,
+              legacy_add_variation_columns_for_world_countries, args.scales, args.legacy_max_rows)
+    benchmark('Worldwide daily values', create_worldwide_aggregate_data, add_variation_columns_for_world_aggregate_data,
+              legacy_add_variation_columns_for_world_aggregate_data, args.scales, args.legacy_max_rows)
+    # Before: rates of the last day only, after: rates of the whole history
+    benchmark('World countries rates', create_country_world_rate_data, calculate_country_world_rates,
+              legacy_calculate_country_world_rates, args.scales, check_function=check_same_rates_of_last_rows)
+    benchmark_series_lookup(args.scales)
+    benchmark_callback_latency_during_refresh(args.scales)
+    benchmark_adaptive_polling()
+
+
+if __name__ == '__main__':
+    run_benchmarks()
@@ -0,0 +1,105 @@
+import numpy as np
+
+GREEN = 'limegreen'
+RED = 'red'
+GREY = 'grey'
+NOT_AVAILABLE = 'N/D'
+
+# Fields of the cards of each scope, in the order of the cards on the page
+CARD_FIELDS = {
+    'national': ['totale_casi', 'totale_positivi', 'dimessi_guariti', 'deceduti', 'terapia_intensiva', 'pressure_ICU',
+                 'tamponi', 'ratio_n_pos_tamponi'],
+    'worldwide': ['Confirmed', 'Deaths', 'Increase rate'],
+    'regional': ['totale_casi', 'totale_positivi', 'dimessi_guariti', 'deceduti', 'terapia_intensiva', 'pressure_ICU',
+                 'isolamento_domiciliare', 'tamponi'],
+    'country_world': ['Confirmed', 'Active_cases', 'Deaths'],
+}
+PERCENTAGE_FIELDS = ('ratio_n_pos_tamponi', 'pressure_ICU')
+
+
+def is_increase(value, variation):
+    return variation > 0
+
+
+def is_decrease(value, variation):
+    return variation < 0
+
+
+def is_not_increase(value, variation):
+    return variation <= 0
+
+
+def is_unchanged(value, variation):
+    return variation == 0
+
+
+def is_decrease_or_still_zero(value, variation):
+    return variation < 0 or (variation == 0 and value == 0)
+
+
+# Variations which are good news and shown in green, for each field of the cards of a scope. Every other variation is
+# shown in red
+CARD_COLOR_RULES = {
+    'national': {'dimessi_guariti': is_increase,
+                 'tamponi': is_increase,
+                 'totale_positivi': is_decrease,
+                 'terapia_intensiva': is_decrease,
+                 'pressure_ICU': is_decrease,
+                 'ratio_n_pos_tamponi': is_decrease},
+    'worldwide': {'Confirmed': is_not_increase},
+    'regional': {'totale_casi': is_not_increase,
+                 'totale_positivi': is_decrease,
+                 'dimessi_guariti': is_increase,
+                 'deceduti': is_unchanged,
+                 'terapia_intensiva': is_decrease_or_still_zero,
+                 'pressure_ICU': is_decrease,
+                 'isolamento_domiciliare': is_decrease,
+                 'tamponi': is_increase},
+    'country_world': {'Confirmed': is_unchanged,
+                      'Active_cases': is_not_increase,
+                      'Deaths': is_unchanged},
+}
+
+
+class Card:
+    """Value of a field and its variation from the previous day, formatted and coloured as shown by a card"""
+
+    def __init__(self, text, variation_text, color, value=None, variation=None):
+        self.text = text
+        self.variation_text = variation_text
+        self.color = color
+        self.value = value
+        self.variation = variation
+
+
+def create_card(scope, field, value, previous_value):
+    variation = value - previous_value
+    percentage = ' %' if field in PERCENTAGE_FIELDS else ''
+    sign = '+' if variation > 0 else ''
+    color_rule = CARD_COLOR_RULES[scope].get(field)
+    color = GREEN if color_rule is not None and color_rule(value, variation) else RED
+    return Card(f'{value:n}{percentage}', f'{sign}{variation:n}{percentage}', color, value, variation)
+
+
+def create_cards_of_last_rows(scope, df):
+    """Cards of a scope with a single entity, from the last two rows of its data"""
+    return {field: create_card(scope, field, df[field].iloc[-1], df[field].iloc[-2]) for field in CARD_FIELDS[scope]}
+
+
+def create_cards_by_entity(scope, df_latest, entity_column, entities_without_data=()):
+    """Cards of every entity of a scope, from its table of the latest rows with the previous values"""
+    cards = {entity: {} for entity in df_latest[entity_column]}
+    for field in CARD_FIELDS[scope]:
+        values = df_latest[field].to_numpy()
+        previous_values = df_latest[f"{field}_previous"].to_numpy()
+        # Previous values are floats when some entity has no previous row, counts are formatted as integers again
+        # (1500000 and not 1.5e+06)
+        if np.issubdtype(values.dtype, np.integer):
+            values = values.tolist()
+            previous_values = [previous_value if np.isnan(previous_value) else int(previous_value)
+                               for previous_value in previous_values]
+        for entity, value, previous_value in zip(df_latest[entity_column], values, previous_values):
+            cards[entity][field] = create_card(scope, field, value, previous_value)
+    for entity in entities_without_data:
+        cards[entity] = {field: Card(NOT_AVAILABLE, NOT_AVAILABLE, GREY) for field in CARD_FIELDS[scope]}
+    return cards
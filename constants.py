@@ -20,6 +20,42 @@ GITHUB_ACCESS_TOKEN_ENV_VAR = "GITHUB_ACCESS_TOKEN"
 GITHUB_USER_ENV_VAR = "GITHUB_USER"
 ONE_SIGNAL_TEST_API_KEY_ENV_VAR = "ONE_SIGNAL_TEST_API_KEY"
 ONE_SIGNAL_PROD_API_KEY_ENV_VAR = "ONE_SIGNAL_PROD_API_KEY"
+CSV_PARSE_ENGINE_ENV_VAR = "CSV_PARSE_ENGINE"
+DATA_SOURCE_ENV_VAR = "DATA_SOURCE"
+DATA_SOURCE_LOCATION_ENV_VAR = "DATA_SOURCE_LOCATION"
+DATA_SOURCE_REPLAY_TIME_ENV_VAR = "DATA_SOURCE_REPLAY_TIME"
+DATA_SOURCE_RECORD_DIRECTORY_ENV_VAR = "DATA_SOURCE_RECORD_DIRECTORY"
+DATA_LOADER_ENV_VAR = "DATA_LOADER"
+REFRESH_IN_SUBPROCESS_ENV_VAR = "REFRESH_IN_SUBPROCESS"
+
+HTTP_CACHE_DIRECTORY = "cache/http"
+MAX_CONCURRENT_DOWNLOADS = 8
+SNAPSHOT_DIRECTORY = "cache/snapshot"
+SNAPSHOT_VERSIONS_TO_KEEP = 3
+SNAPSHOT_POLL_SECONDS = 15
+# Below POLLING_BASE_SECONDS, a hung refresh subprocess never holds back more than one check of the sources
+REFRESH_SUBPROCESS_TIMEOUT_SECONDS = 900
+LEADER_LOCK_FILE = "cache/leader.lock"
+SCHEDULER_TIMEZONE = "Europe/Rome"
+SCHEDULER_COALESCE_SECONDS = 300
+FETCH_LOG_FILE = "cache/fetch_log.jsonl"
+FETCH_LOG_RETENTION_DAYS = 28
+POLLING_BASE_SECONDS = 1800
+POLLING_MAX_SECONDS = 14400
+POLLING_WINDOW_SECONDS = 300
+POLLING_WINDOW_MARGIN_MINUTES = 30
+POLLING_MIN_CHANGES = 3
+POLLING_DUE_TOLERANCE_SECONDS = 60
+APPEND_CHECK_TAIL_BYTES = 65536
+DOWNLOAD_CHUNK_BYTES = 1048576
+CSV_CHUNK_SIZE_ROWS = 100000
+HTTP_CONNECT_TIMEOUT_SECONDS = 5
+HTTP_READ_TIMEOUT_SECONDS = 30
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_SECONDS = 0.5
+HTTP_MAX_BACKOFF_SECONDS = 8
+HTTP_POOL_SIZE = MAX_CONCURRENT_DOWNLOADS
+RECORD_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S"
 
 URL_CSV_REGIONAL_DATA = \
     "https://raw.githubusercontent.com/pcm-dpc/COVID-19/master/dati-regioni/dpc-covid19-ita-regioni.csv"
@@ -41,10 +77,21 @@ URL_VACCINES_ITA_ADMINISTRATIONS_SUMMARY_LATEST = "https://raw.githubusercontent
 URL_VACCINES_ITA_ADMINISTRATIONS = "https://raw.githubusercontent.com/italia/covid19-opendata-vaccini/master/dati/somministrazioni-vaccini-latest.csv"
 URL_VACCINES_ITA_DELIVERIES = "https://raw.githubusercontent.com/italia/covid19-opendata-vaccini/master/dati/consegne-vaccini-latest.csv"
 URL_VACCINES_ITA_ADMINISTRATION_POINT = "https://raw.githubusercontent.com/italia/covid19-opendata-vaccini/master/dati/punti-somministrazione-latest.csv"
+LIST_OF_VACCINES_ITA_URLS = (URL_VACCINES_ITA_SUMMARY_LATEST, URL_VACCINES_ITA_REGISTRY_SUMMARY_LATEST,
+                             URL_VACCINES_ITA_ADMINISTRATIONS_SUMMARY_LATEST, URL_VACCINES_ITA_ADMINISTRATIONS,
+                             URL_VACCINES_ITA_ADMINISTRATION_POINT)
 URL_VACCINES_WORLD = "https://github.com/owid/covid-19-data/tree/master/public/data/vaccinations"
 
 
 LIST_OF_WORLD_COUNTRIES_WITHOUT_DATA = ('Turkmenistan', 'Myanmar', 'North Korea', 'Greenland')
+LIST_OF_ITALY_FIELDS = ('ricoverati_con_sintomi', 'terapia_intensiva', 'totale_ospedalizzati', 'isolamento_domiciliare',
+                        'totale_positivi', 'variazione_totale_positivi', 'nuovi_positivi', 'dimessi_guariti', 'deceduti',
+                        'casi_da_sospetto_diagnostico', 'casi_da_screening', 'totale_casi', 'tamponi', 'casi_testati')
 LIST_OF_WORLD_FIELDS = ('Confirmed', 'Deaths', 'New Confirmed', 'New Deaths', 'Active_cases')
 LIST_OF_WORLD_FIELDS_TO_RATE = ('Confirmed', 'Deaths', 'Active_cases', 'New Confirmed', 'New Deaths')
 LIST_OF_NOT_LOCATED_COUNTRIES_ON_MAP = ('Diamond Princess', 'MS Zaandam', 'Holy See')
+LIST_OF_DATA_SOURCE_URLS = (URL_CSV_REGIONAL_DATA, URL_CSV_ITALY_DATA, URL_CSV_WORLD_COUNTRIES_DATA,
+                            URL_CSV_WORLDWIDE_AGGREGATE_DATA) + LIST_OF_VACCINES_ITA_URLS
+# Sources that only grow appending rows at the end of the file, these are updated downloading only the new bytes.
+# The countries aggregated file is sorted by country, so its new rows are not appended at the end
+LIST_OF_APPEND_ONLY_URLS = (URL_CSV_REGIONAL_DATA, URL_CSV_ITALY_DATA, URL_CSV_WORLDWIDE_AGGREGATE_DATA)
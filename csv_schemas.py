@@ -0,0 +1,58 @@
+import constants
+
+DPC_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S'
+ISO_DATE_FORMAT = '%Y-%m-%d'
+
+
+class CsvSchema:
+
+    def __init__(self, dtype, date_columns=(), date_format=None):
+        # Only the columns listed in dtype and date_columns are read from the file
+        self.dtype = dtype
+        self.date_columns = list(date_columns)
+        self.date_format = date_format
+
+    @property
+    def usecols(self):
+        return list(self.dtype.keys()) + self.date_columns
+
+
+# Counters are int32 when always present. Counters which are empty for the first days are float64, because
+# float32 can not represent exactly the values above 2^24 reached by the national counters
+italian_fields_dtype = {'ricoverati_con_sintomi': 'int32', 'terapia_intensiva': 'int32',
+                        'totale_ospedalizzati': 'int32', 'isolamento_domiciliare': 'int32',
+                        'totale_positivi': 'int32', 'variazione_totale_positivi': 'int32',
+                        'nuovi_positivi': 'int32', 'dimessi_guariti': 'int32', 'deceduti': 'int32',
+                        'casi_da_sospetto_diagnostico': 'float64', 'casi_da_screening': 'float64',
+                        'totale_casi': 'int32', 'tamponi': 'int32', 'casi_testati': 'float64'}
+
+csv_schemas = {
+    constants.URL_CSV_REGIONAL_DATA: CsvSchema(
+        {'codice_regione': 'int32', 'denominazione_regione': 'category', **italian_fields_dtype},
+        [constants.DATE_PROPERTY_NAME_IT], DPC_DATE_FORMAT),
+    constants.URL_CSV_ITALY_DATA: CsvSchema(italian_fields_dtype, [constants.DATE_PROPERTY_NAME_IT], DPC_DATE_FORMAT),
+    constants.URL_CSV_WORLD_COUNTRIES_DATA: CsvSchema(
+        {'Country': 'category', 'Confirmed': 'int32', 'Deaths': 'int32'},
+        [constants.DATE_PROPERTY_NAME_EN], ISO_DATE_FORMAT),
+    constants.URL_CSV_WORLDWIDE_AGGREGATE_DATA: CsvSchema(
+        {'Confirmed': 'int32', 'Deaths': 'int32', 'Increase rate': 'float64'},
+        [constants.DATE_PROPERTY_NAME_EN], ISO_DATE_FORMAT),
+    constants.URL_VACCINES_ITA_SUMMARY_LATEST: CsvSchema(
+        {'area': 'category', 'dosi_somministrate': 'int32', 'dosi_consegnate': 'int32',
+         'percentuale_somministrazione': 'float64'},
+        [constants.DATE_PROPERTY_NAME_VACCINES_ITA_LAST_UPDATE], ISO_DATE_FORMAT),
+    constants.URL_VACCINES_ITA_REGISTRY_SUMMARY_LATEST: CsvSchema(
+        {'eta': 'category', 'totale': 'int32', 'm': 'int32', 'f': 'int32', 'd1': 'int32', 'd2': 'int32',
+         'dpi': 'int32', 'db1': 'int32'},
+        [constants.DATE_PROPERTY_NAME_VACCINES_ITA_LAST_UPDATE], ISO_DATE_FORMAT),
+    constants.URL_VACCINES_ITA_ADMINISTRATIONS_SUMMARY_LATEST: CsvSchema(
+        {'totale': 'int32', 'd1': 'int32', 'd2': 'int32', 'dpi': 'int32'},
+        ['data'], ISO_DATE_FORMAT),
+    constants.URL_VACCINES_ITA_ADMINISTRATIONS: CsvSchema(
+        {'forn': 'category', 'area': 'category', 'd1': 'int32', 'd2': 'int32', 'dpi': 'int32', 'db1': 'int32'},
+        ['data'], ISO_DATE_FORMAT),
+}
+
+
+def get_csv_schema(url):
+    return csv_schemas.get(url)
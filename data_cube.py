@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+
+class DataCube:
+    """Numeric columns of a long format DataFrame held as a dense array with axes metric, entity and date.
+
+    All the entities share the same date axis and days missing for an entity are NaN. The series of an entity is a
+    view of the array, so reading it does not depend on the number of rows of the DataFrame.
+    """
+
+    def __init__(self, df, entity_column, date_column):
+        metrics = list(df.select_dtypes(include='number').columns)
+        entity_codes, entities = pd.factorize(df[entity_column], sort=True)
+        date_codes, dates = pd.factorize(df[date_column], sort=True)
+        self.metrics = {metric: position for position, metric in enumerate(metrics)}
+        self.metric_dtypes = {metric: df[metric].dtype for metric in metrics}
+        self.entities = {entity: position for position, entity in enumerate(entities)}
+        self.dates = pd.DatetimeIndex(dates)
+        self.values = np.full((len(metrics), len(entities), len(dates)), np.nan)
+        # For an entity with more rows on the same date, the last row is kept
+        is_valid_row = (entity_codes >= 0) & (date_codes >= 0)
+        entity_codes = entity_codes[is_valid_row]
+        date_codes = date_codes[is_valid_row]
+        for position, metric in enumerate(metrics):
+            self.values[position, entity_codes, date_codes] = df[metric].to_numpy(dtype='float64')[is_valid_row]
+        # The cube is shared by all the requests, nobody is allowed to change it
+        self.values.flags.writeable = False
+
+    def has_entity(self, entity):
+        return entity in self.entities
+
+    def get_series(self, metric, entity):
+        """Values of the metric for the entity on every date of the date axis"""
+        return self.values[self.metrics[metric], self.entities[entity]]
+
+    def get_available_series(self, metric, entity):
+        """Dates with a value for the entity and their values, with the original type of the column"""
+        series = self.get_series(metric, entity)
+        is_available = ~np.isnan(series)
+        return self.dates[is_available], series[is_available].astype(self.metric_dtypes[metric])
+
+    def get_last_values(self, metric, entity, count=2):
+        """Last count values available for the entity, with the original type of the column"""
+        return self.get_available_series(metric, entity)[1][-count:]
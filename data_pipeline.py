@@ -0,0 +1,475 @@
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+import constants
+import logger
+from cards import CARD_FIELDS, create_cards_of_last_rows, create_cards_by_entity
+from csv_schemas import get_csv_schema
+from data_cube import DataCube
+from rankings import Rankings
+from time_series import calculate_daily_values, calculate_rolling_average
+from reference_data import reference_data
+from utils import load_csv, aggregate_csv_in_chunks
+
+log = logger.get_logger()
+
+field_list_to_rate_italian_regions = ['ricoverati_con_sintomi', 'terapia_intensiva',
+                                      'totale_ospedalizzati', 'isolamento_domiciliare',
+                                      'totale_positivi', 'nuovi_positivi', 'dimessi_guariti',
+                                      'deceduti', 'casi_da_sospetto_diagnostico', 'casi_da_screening', 'totale_casi',
+                                      'tamponi', 'casi_testati']
+
+italy_regional_population = reference_data.register('italy_regional_population',
+                                                     'assets/italy_region_population_2020.csv', 'region', 'population',
+                                                     {'region': str, 'population': 'int64'})
+italy_ICU = reference_data.register('italy_ICU', 'assets/italian_ICU_19_10_2020.csv', 'region', 'available_ICU',
+                                    {'region': str, 'available_ICU': 'int64'})
+world_population = reference_data.register('world_population', 'assets/worldwide_population_2020.csv', 'country',
+                                           'population', {'country': str, 'population': 'int64'})
+
+
+# P.A. Bolzano and P.A. Trento are merged in the Trentino-Alto Adige region (codice_regione 4) to match the GeoJson
+# structure
+region_code_mapping = {21: 4, 22: 4}
+mapped_region_names = {4: 'Trentino-Alto Adige'}
+field_list_to_sum_mapped_regions = field_list_to_rate_italian_regions + ['variazione_totale_positivi']
+
+
+def remap_regions(df):
+    """Return the regional data with the rows of the regions in region_code_mapping summed in their target region.
+
+    All the dates are remapped at once. The merged rows come after the other regions of the same date, a sum with a
+    missing value is missing.
+    """
+    date_column = constants.DATE_PROPERTY_NAME_IT
+    fields = field_list_to_sum_mapped_regions
+    is_mapped = df['codice_regione'].isin(region_code_mapping.keys()).to_numpy()
+    df_mapped = df[is_mapped].sort_values(by=[date_column, 'codice_regione'], kind='mergesort')
+    keys = [df_mapped[date_column], df_mapped['codice_regione'].map(region_code_mapping)]
+    sums = df_mapped[fields].groupby(keys, sort=False).sum()
+    sums = sums.mask(df_mapped[fields].isna().groupby(keys, sort=False).any())
+    df_merged = df_mapped.groupby(keys, sort=False).tail(1).copy()
+    df_merged['codice_regione'] = df_merged['codice_regione'].map(region_code_mapping).astype(df['codice_regione'].dtype)
+    df_merged['denominazione_regione'] = df_merged['codice_regione'].map(mapped_region_names)
+    sums = sums.reindex(pd.MultiIndex.from_frame(df_merged[[date_column, 'codice_regione']]))
+    for field in fields:
+        df_merged[field] = sums[field].to_numpy()
+    df_merged = derive_regional_data(df_merged.astype(df[fields].dtypes.to_dict()))
+    df_remapped = pd.concat([df[~is_mapped], df_merged], ignore_index=True)
+    df_remapped['denominazione_regione'] = df_remapped['denominazione_regione'].astype('category')
+    return df_remapped.sort_values(by=[date_column], kind='mergesort', ignore_index=True)
+
+
+def get_positions_from_end(df, entity_column):
+    # Rows of each entity are in date order, so the last row of an entity has position 0
+    return df.groupby(entity_column, sort=False, observed=True).cumcount(ascending=False).to_numpy()
+
+
+def get_rows_from_end(df, entity_column, position=0):
+    """Row of every entity at the given position from its last one (0 is the latest), in the order of the DataFrame"""
+    return df[get_positions_from_end(df, entity_column) == position]
+
+
+def create_latest_rows_table(df, entity_column, fields):
+    """Latest row of every entity, with the value of the previous row and the day-over-day variation of each metric
+    field. Other columns, e.g. the codes of the entities, are only copied from the latest row"""
+    positions_from_end = get_positions_from_end(df, entity_column)
+    df_latest = df[positions_from_end == 0].copy()
+    fields = list(dict.fromkeys(fields))
+    df_previous = df[positions_from_end == 1].set_index(entity_column)[fields].reindex(df_latest[entity_column])
+    for field in fields:
+        previous_values = df_previous[field].to_numpy()
+        df_latest[f"{field}_previous"] = previous_values
+        df_latest[f"{field}_variation"] = df_latest[field].to_numpy() - previous_values
+    return df_latest
+
+
+def calculate_rates(df, entity_column, population_table, fields, population_column, date_column=None):
+    """Return a copy of df with the fields as values per INHABITANT_RATE inhabitants, computed for all the rows at once.
+
+    The population is joined on the entity name (as of date_column for dated populations), the rates of entities
+    without a known population are NaN.
+    """
+    df_rate = df.copy()
+    population = population_table.join_values(df_rate, entity_column, date_column)
+    df_rate[population_column] = population
+    for field in fields:
+        df_rate[field] = np.round(df_rate[field].to_numpy(dtype='float64') / population * constants.INHABITANT_RATE, 2)
+    return df_rate
+
+
+def load_country_world_rate_history(df):
+    return calculate_rates(df, 'Country', world_population, list(constants.LIST_OF_WORLD_FIELDS_TO_RATE), 'Population',
+                           constants.DATE_PROPERTY_NAME_EN)
+
+
+def load_country_world_rate_data_frame(df_rate_history):
+    return get_rows_from_end(df_rate_history, 'Country').sort_values(by=['Country'])
+
+
+def load_region_rate_history(df):
+    return calculate_rates(remap_regions(df), 'denominazione_regione', italy_regional_population,
+                           field_list_to_rate_italian_regions, 'population', constants.DATE_PROPERTY_NAME_IT)
+
+
+def load_region_rate_data_frame(df_rate_history):
+    return get_rows_from_end(df_rate_history, 'denominazione_regione')
+
+
+def load_region_available_icu(df_sb):
+    df_sb['available_ICU'] = italy_ICU.join_values(df_sb, 'denominazione_regione', constants.DATE_PROPERTY_NAME_IT)
+    return df_sb
+
+
+def adjust_df_world_to_geojson(df):
+    df['Country'] = df['Country'].replace(['US', 'Congo (Kinshasa)', 'Congo (Brazzaville)', 'Korea, South',
+                                           'Cote d\'Ivoire', 'Czechia', 'Serbia', 'Taiwan*', 'Tanzania',
+                                           'North Macedonia'],
+                                          ['United States of America', 'Democratic Republic of the Congo',
+                                           'Republic of Congo', 'South Korea',
+                                           'Ivory Coast', 'Czech Republic', 'Republic of Serbia', 'Taiwan',
+                                           'United Republic of Tanzania', 'Macedonia']
+                                          )
+    return df
+
+
+# for adding country not included in the df_country world source
+# useful for mapping countries with geojson data
+def add_excluded_country_world(df):
+    last_date_df = df.iloc[-1][constants.DATE_PROPERTY_NAME_EN]
+    list_of_row = []
+    countries = set(df['Country'])
+    for country_without_data in constants.LIST_OF_WORLD_COUNTRIES_WITHOUT_DATA:
+        if country_without_data in countries:
+            continue
+        list_of_row.append({'Date': last_date_df,
+                            'Country': country_without_data,
+                            'Confirmed': 0,
+                            'Deaths': 0,
+                            'Active_cases': 0,
+                            'New Confirmed': 0.0,
+                            'New Deaths': 0.0
+                            })
+
+    for row in list_of_row:
+        df = df.append(row, ignore_index=True)
+    return df
+
+
+def add_variation_new_swabs_column_df_italy(df):
+    df['nuovi_tamponi'] = calculate_daily_values(df['tamponi'])
+    return df
+
+
+def add_variation_columns_for_world_aggregate_data(df):
+    for col in ('Confirmed', 'Deaths'):
+        df[f"New {col}"] = calculate_daily_values(df[col])
+    return df
+
+
+def add_variation_columns(df, columns, group_column, date_column):
+    """Add for each cumulative column a 'New <column>' column with its variation from the previous row of the group.
+
+    Rows of a group are compared in date order: the first row of each group has variation 0, corrections of the
+    cumulative values are kept as negative variations and after missing days the variation covers the whole gap.
+    """
+    df_sorted = df[[group_column, date_column] + columns].sort_values([group_column, date_column])
+    variations = df_sorted.groupby(group_column, sort=False, observed=True)[columns].diff().fillna(0)
+    for column in columns:
+        # Assigned by index, so the rows keep their original order
+        df[f"New {column}"] = variations[column].astype('float64')
+    return df
+
+
+def add_variation_columns_for_world_countries(df):
+    return add_variation_columns(df, ['Confirmed', 'Deaths'], 'Country', constants.DATE_PROPERTY_NAME_EN)
+
+
+def add_total_on_day_administrations_vaccines_italy(df):
+    df['total_on_today'] = 0
+    df = df.groupby('data').sum()
+    df.reset_index(inplace=True)
+    df['total_on_today'] = df['totale'].cumsum()
+    return df
+
+
+def add_daily_administrations_italy(df):
+    df['administrated_people'] = 0
+    df = df.groupby('data').sum()
+    df.reset_index(inplace=True)
+    df['administrated_people'] = df['d1'].cumsum() + df['d2'].cumsum() + df[
+        'dpi'].cumsum()
+    # we need to consider only the audience of people actually immunized
+    df['remaining_administrations'] = df['d2'].cumsum() + df['dpi'].cumsum()
+    # The first day keeps its own total, the following ones the variation of the people administrated
+    df['totale'] = calculate_daily_values(df['administrated_people'], df['totale'].iloc[0]).astype(df['totale'].dtype)
+    # df.drop(df[df.d2 == 0].index, inplace=True)
+    df['mov_avg'] = round(calculate_rolling_average(df['totale']), 0)
+    return df
+
+
+def add_percentage_vaccination_italy_phases(df):
+    df['percentage_vaccinated_population'] = 0
+    df = df.groupby('data').sum()
+    df.reset_index(inplace=True)
+    df['percentage_vaccinated_population'] = round(((df['d2'] + df['dpi'])
+                                                    / constants.VACCINABLE_ITALIAN_POPULATION) * 100, 2)
+    df['percentage_vaccinated_population'] = df['percentage_vaccinated_population'].cumsum()
+    return df
+
+
+def load_data_frame_from_fetch_result(fetch_result, df_previous, previous_version, date_property_name,
+                                      derive_function):
+    # When only new rows were downloaded on top of the data already in memory, just these rows are parsed
+    if fetch_result.appended_content is not None and df_previous is not None \
+            and fetch_result.previous_version == previous_version:
+        log.info(f"Appending {len(fetch_result.appended_content)} new bytes to the data of {fetch_result.url}")
+        with open(fetch_result.body_path, 'rb') as body_file:
+            header = body_file.readline()
+        df_new_rows = load_csv(io.BytesIO(header + fetch_result.appended_content), date_property_name,
+                               get_csv_schema(fetch_result.url), fetch_result.url)
+        return append_new_rows(df_previous, df_new_rows, derive_function)
+    return derive_function(load_fetched_csv(fetch_result, date_property_name))
+
+
+def append_new_rows(df_previous, df_new_rows, derive_function):
+    # The last known row is derived again together with the new ones, so that variations between consecutive rows
+    # are calculated also for the first new row
+    df_last_row = df_previous.tail(1)[df_new_rows.columns]
+    df_derived = derive_function(pd.concat([df_last_row, df_new_rows], ignore_index=True))
+    return pd.concat([df_previous, df_derived.iloc[1:]], ignore_index=True)
+
+
+def derive_regional_data(df):
+    df = load_region_available_icu(df)
+    df['available_ICU'] = pd.to_numeric(df['available_ICU'], downcast='float')
+    df['pressure_ICU'] = round(((df['terapia_intensiva'] / df['available_ICU']) * 100), 2)
+    return df
+
+
+def derive_national_data(df):
+    df = add_variation_new_swabs_column_df_italy(df)
+    df['ratio_n_pos_tamponi'] = round(((df['nuovi_positivi'] / df['nuovi_tamponi']) * 100), 2)
+    df['pressure_ICU'] = round(((df['terapia_intensiva'] / constants.TOTAL_ICU_ITALY) * 100), 2)
+    return df
+
+
+def derive_worldwide_aggregate_data(df):
+    df['Active_cases'] = df['Confirmed'] - df['Deaths']
+    df = add_variation_columns_for_world_aggregate_data(df)
+    return df
+
+
+def load_regional_data(fetch_result, df_previous, previous_version):
+    return load_data_frame_from_fetch_result(fetch_result, df_previous, previous_version,
+                                             constants.DATE_PROPERTY_NAME_IT, derive_regional_data)
+
+
+def load_national_data(fetch_result, df_previous, previous_version):
+    return load_data_frame_from_fetch_result(fetch_result, df_previous, previous_version,
+                                             constants.DATE_PROPERTY_NAME_IT, derive_national_data)
+
+
+def load_worldwide_aggregate_data(fetch_result, df_previous, previous_version):
+    return load_data_frame_from_fetch_result(fetch_result, df_previous, previous_version,
+                                             constants.DATE_PROPERTY_NAME_EN, derive_worldwide_aggregate_data)
+
+
+def load_country_world_data(fetch_result):
+    df_country_world = load_fetched_csv(fetch_result, constants.DATE_PROPERTY_NAME_EN)
+    df_country_world['Active_cases'] = df_country_world['Confirmed'] - df_country_world['Deaths']
+    df_country_world = adjust_df_world_to_geojson(df_country_world)
+    # Placeholder rows are added after the variations, so they never take part to the differences
+    df_country_world = add_variation_columns_for_world_countries(df_country_world)
+    return add_excluded_country_world(df_country_world)
+
+
+def aggregate_vaccines_italy_administrations(fetch_result):
+    # The administrations file has a row for each date, region, supplier and age band: only its sums by supplier,
+    # day and region are kept in memory
+    aggregates = aggregate_csv_in_chunks(fetch_result.body_path, get_csv_schema(fetch_result.url),
+                                         ['forn', 'data', 'area'], ['d1', 'd2', 'dpi', 'db1'])
+    df_by_supplier = aggregates['forn']
+    df_by_supplier['total_administrations'] = df_by_supplier['d1'] + df_by_supplier['d2'] + df_by_supplier['db1']
+    return {'df_vaccines_italy_administrations_by_supplier': df_by_supplier,
+            'df_vaccines_italy_administrations_by_day': aggregates['data'],
+            'df_vaccines_italy_administrations_by_area': aggregates['area']}
+
+
+def load_fetched_csv(fetch_result, data_string=None):
+    return load_csv(fetch_result.body_path, data_string, get_csv_schema(fetch_result.url), fetch_result.url)
+
+
+class DatasetNode:
+
+    def __init__(self, name, inputs, compute, outputs=None, incremental=False, persisted=True):
+        self.name = name
+        # Names of the sources and of the other nodes the dataset is computed from
+        self.inputs = inputs
+        # Called with the input values. Incremental nodes also receive their last value and version, so they can
+        # extend it instead of computing it from scratch
+        self.compute = compute
+        # A node with more outputs returns a dict output name -> DataFrame
+        self.outputs = outputs
+        self.incremental = incremental
+        # Values which are not DataFrames are not saved in the data snapshot, they are computed again when it is loaded
+        self.persisted = persisted
+
+    @property
+    def output_names(self):
+        return self.outputs or [self.name]
+
+
+def sort_nodes(source_names, nodes):
+    """Return the nodes in an order where every node comes after the nodes it depends on"""
+    nodes_by_name = {node.name: node for node in nodes}
+    for node in nodes:
+        for input_name in node.inputs:
+            if input_name not in source_names and input_name not in nodes_by_name:
+                raise ValueError(f"Unknown input {input_name} of dataset {node.name}")
+    sorted_nodes = []
+    available_names = set(source_names)
+    pending_nodes = list(nodes)
+    while pending_nodes:
+        ready_nodes = [node for node in pending_nodes if available_names.issuperset(node.inputs)]
+        if not ready_nodes:
+            raise ValueError(f"Datasets with circular dependencies: {[node.name for node in pending_nodes]}")
+        for node in ready_nodes:
+            sorted_nodes.append(node)
+            available_names.add(node.name)
+            pending_nodes.remove(node)
+    return sorted_nodes
+
+
+class DataPipeline:
+    """Graph of the raw sources and of the datasets derived from them.
+
+    Every source and dataset has a content version: the version of a source is the version of its file, the version
+    of a dataset is made of the versions of its inputs. A refresh only computes the datasets whose inputs changed.
+    """
+
+    def __init__(self, sources, nodes):
+        # Source name -> URL of the file
+        self.sources = sources
+        self.nodes = sort_nodes(sources.keys(), nodes)
+
+    @property
+    def frame_names(self):
+        return [output_name for node in self.nodes if node.persisted for output_name in node.output_names]
+
+    def restore(self, frames):
+        """Return the values of the datasets which are not persisted, computed from the DataFrames of a snapshot"""
+        restored_values = {}
+        for node in self.nodes:
+            if not node.persisted:
+                restored_values[node.name] = node.compute(*[restored_values.get(name, frames.get(name))
+                                                             for name in node.inputs])
+        return restored_values
+
+    def refresh(self, fetch_results, frames, versions, persisted_only=False):
+        """Return the DataFrames computed again and the new versions of sources and datasets.
+
+        frames holds the current DataFrames by name and versions the content versions of the previous refresh. With
+        persisted_only the datasets which are not persisted are not computed, e.g. when only a snapshot is produced.
+        """
+        start_time = time.time()
+        new_versions = dict(versions)
+        changed_names = set()
+        for name, url in self.sources.items():
+            # Sources not checked by this refresh are not in fetch_results
+            if url not in fetch_results:
+                continue
+            fetch_result = fetch_results[url]
+            if fetch_result is None:
+                log.info(f"Provider's server for {name} is unresponsive, retrying later")
+            elif fetch_result.version != versions.get(name):
+                log.info(f"Source {name} changed. Old content version: {versions.get(name)}, "
+                         f"new content version: {fetch_result.version}")
+                new_versions[name] = fetch_result.version
+                changed_names.add(name)
+
+        data_updates = {}
+        for node in self.nodes:
+            if changed_names.isdisjoint(node.inputs) or (persisted_only and not node.persisted):
+                continue
+            input_values = [fetch_results.get(self.sources[name]) if name in self.sources
+                            else data_updates.get(name, frames.get(name)) for name in node.inputs]
+            if any(value is None for value in input_values):
+                log.info(f"Inputs of dataset {node.name} are not available, retrying later")
+                continue
+            node_start_time = time.time()
+            if node.incremental:
+                input_values += [frames.get(node.name), versions.get(node.name)]
+            result = node.compute(*input_values)
+            data_updates.update(result if node.outputs else {node.name: result})
+            new_versions[node.name] = '|'.join(str(new_versions[name]) for name in node.inputs)
+            changed_names.add(node.name)
+            log.info(f"Dataset {node.name} computed in {round(time.time() - node_start_time, 2)} seconds")
+        log.info(f"Data pipeline refreshed {len(changed_names)} sources and datasets "
+                 f"in {round(time.time() - start_time, 2)} seconds")
+        return data_updates, new_versions
+
+
+data_pipeline = DataPipeline(
+    {'regional_data': constants.URL_CSV_REGIONAL_DATA,
+     'national_data': constants.URL_CSV_ITALY_DATA,
+     'country_world_data': constants.URL_CSV_WORLD_COUNTRIES_DATA,
+     'worldwide_aggregate_data': constants.URL_CSV_WORLDWIDE_AGGREGATE_DATA,
+     'vaccines_italy_summary': constants.URL_VACCINES_ITA_SUMMARY_LATEST,
+     'vaccines_italy_registry_summary': constants.URL_VACCINES_ITA_REGISTRY_SUMMARY_LATEST,
+     'vaccines_italy_administrations_summary': constants.URL_VACCINES_ITA_ADMINISTRATIONS_SUMMARY_LATEST,
+     'vaccines_italy_administrations': constants.URL_VACCINES_ITA_ADMINISTRATIONS,
+     'vaccines_italy_administration_point': constants.URL_VACCINES_ITA_ADMINISTRATION_POINT},
+    [DatasetNode('df_worldwide_aggregate_data', ['worldwide_aggregate_data'], load_worldwide_aggregate_data,
+                 incremental=True),
+     DatasetNode('worldwide_cards', ['df_worldwide_aggregate_data'],
+                 lambda df: create_cards_of_last_rows('worldwide', df), persisted=False),
+     DatasetNode('df_country_world_data', ['country_world_data'], load_country_world_data),
+     DatasetNode('df_country_world_latest', ['df_country_world_data'],
+                 lambda df: create_latest_rows_table(df, 'Country', constants.LIST_OF_WORLD_FIELDS
+                                                     + tuple(CARD_FIELDS['country_world']))),
+     DatasetNode('country_world_rankings', ['df_country_world_latest'],
+                 lambda df: Rankings(df, 'Country', constants.LIST_OF_WORLD_FIELDS), persisted=False),
+     DatasetNode('country_world_cards', ['df_country_world_latest'],
+                 lambda df: create_cards_by_entity('country_world', df, 'Country',
+                                                   constants.LIST_OF_WORLD_COUNTRIES_WITHOUT_DATA), persisted=False),
+     DatasetNode('df_rate_country_world_history', ['df_country_world_data'], load_country_world_rate_history),
+     DatasetNode('df_rate_country_world', ['df_rate_country_world_history'], load_country_world_rate_data_frame),
+     DatasetNode('country_world_data_cube', ['df_country_world_data'],
+                 lambda df: DataCube(df, 'Country', constants.DATE_PROPERTY_NAME_EN), persisted=False),
+     DatasetNode('df_national_data', ['national_data'], load_national_data, incremental=True),
+     DatasetNode('national_cards', ['df_national_data'],
+                 lambda df: create_cards_of_last_rows('national', df), persisted=False),
+     DatasetNode('df_regional_data', ['regional_data'], load_regional_data, incremental=True),
+     DatasetNode('df_regional_latest', ['df_regional_data'],
+                 lambda df: create_latest_rows_table(df, 'denominazione_regione', constants.LIST_OF_ITALY_FIELDS
+                                                     + tuple(CARD_FIELDS['regional']))),
+     DatasetNode('regional_rankings', ['df_regional_latest'],
+                 lambda df: Rankings(df, 'denominazione_regione', constants.LIST_OF_ITALY_FIELDS), persisted=False),
+     DatasetNode('regional_cards', ['df_regional_latest'],
+                 lambda df: create_cards_by_entity('regional', df, 'denominazione_regione'), persisted=False),
+     DatasetNode('df_rate_regional_history', ['df_regional_data'], load_region_rate_history),
+     DatasetNode('df_rate_regional', ['df_rate_regional_history'], load_region_rate_data_frame),
+     DatasetNode('regional_data_cube', ['df_regional_data'],
+                 lambda df: DataCube(df, 'denominazione_regione', constants.DATE_PROPERTY_NAME_IT), persisted=False),
+     DatasetNode('df_vaccines_italy_summary_latest', ['vaccines_italy_summary'],
+                 lambda fetch_result: load_fetched_csv(fetch_result,
+                                                       constants.DATE_PROPERTY_NAME_VACCINES_ITA_LAST_UPDATE)),
+     DatasetNode('df_vaccines_italy_registry_summary_latest', ['vaccines_italy_registry_summary'],
+                 lambda fetch_result: load_fetched_csv(fetch_result,
+                                                       constants.DATE_PROPERTY_NAME_VACCINES_ITA_LAST_UPDATE)),
+     DatasetNode('df_vaccines_italy_admin_summary_latest', ['vaccines_italy_administrations_summary'],
+                 lambda fetch_result: load_fetched_csv(fetch_result, 'data')),
+     DatasetNode('vaccines_italy_administrations_aggregates', ['vaccines_italy_administrations'],
+                 aggregate_vaccines_italy_administrations,
+                 outputs=['df_vaccines_italy_administrations_by_supplier', 'df_vaccines_italy_administrations_by_day',
+                          'df_vaccines_italy_administrations_by_area']),
+     DatasetNode('df_vaccines_italy_admin_summary_latest_grouped_by_ITA', ['df_vaccines_italy_admin_summary_latest'],
+                 add_total_on_day_administrations_vaccines_italy),
+     DatasetNode('df_vaccines_italy_daily_summary_latest_grouped_by_ITA', ['df_vaccines_italy_admin_summary_latest'],
+                 add_daily_administrations_italy),
+     DatasetNode('df_vaccines_italy_administration_point', ['vaccines_italy_administration_point'],
+                 load_fetched_csv)])
@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import time
+
+from pyarrow import feather
+
+import logger
+from constants import SNAPSHOT_DIRECTORY, SNAPSHOT_VERSIONS_TO_KEEP
+
+log = logger.get_logger()
+
+MANIFEST_FILE_NAME = "manifest.json"
+# File holding the name of the snapshot currently published, replaced atomically to publish a new one
+POINTER_FILE_NAME = "CURRENT"
+
+
+def prepare_frame_for_snapshot(df):
+    # Feather needs a default index and columns holding a single type. Columns mixing numbers and strings
+    # (e.g. an empty string used as placeholder) are stored as strings
+    df = df.reset_index(drop=True)
+    for column in df.select_dtypes(include='object').columns:
+        if df[column].dropna().map(type).nunique() > 1:
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+    return df
+
+
+def write_frame(df, path):
+    # Uncompressed and in a single chunk, so that the columns can be memory-mapped without any copy
+    df = prepare_frame_for_snapshot(df)
+    df.to_feather(path, compression='uncompressed', chunksize=max(len(df), 1))
+
+
+def read_frame(path):
+    """DataFrame of a snapshot file memory-mapped: numeric and date columns without missing values point to the file
+    itself, they are read-only and shared through the page cache by every process mapping the same file"""
+    return feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+
+
+def read_current_snapshot_name():
+    """Name of the snapshot currently published, None if no snapshot was published yet"""
+    try:
+        with open(os.path.join(SNAPSHOT_DIRECTORY, POINTER_FILE_NAME), 'r') as pointer_file:
+            return pointer_file.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish_snapshot_name(name):
+    temporary_pointer_path = os.path.join(SNAPSHOT_DIRECTORY, f"{POINTER_FILE_NAME}.{os.getpid()}.tmp")
+    with open(temporary_pointer_path, 'w') as pointer_file:
+        pointer_file.write(name)
+        pointer_file.flush()
+        os.fsync(pointer_file.fileno())
+    # A rename is atomic: readers find either the previous snapshot name or the new one
+    os.replace(temporary_pointer_path, os.path.join(SNAPSHOT_DIRECTORY, POINTER_FILE_NAME))
+
+
+def remove_old_snapshots(current_name):
+    # Processes still mapping a removed snapshot keep reading it until they unmap it, the space is then released
+    snapshot_names = [name for name in os.listdir(SNAPSHOT_DIRECTORY)
+                      if os.path.exists(os.path.join(SNAPSHOT_DIRECTORY, name, MANIFEST_FILE_NAME))]
+    snapshot_names.sort(key=lambda name: os.path.getmtime(os.path.join(SNAPSHOT_DIRECTORY, name)))
+    for name in snapshot_names[:-SNAPSHOT_VERSIONS_TO_KEEP]:
+        if name != current_name:
+            shutil.rmtree(os.path.join(SNAPSHOT_DIRECTORY, name), ignore_errors=True)
+
+
+def save_snapshot(frames, metadata, version):
+    """Persist the DataFrames and their metadata (content versions, last check) as a new snapshot of the data version
+    and publish it. Return the name of the snapshot, None if it could not be saved"""
+    start_time = time.time()
+    name = f"v{version:06d}-{time.time_ns()}"
+    snapshot_directory = os.path.join(SNAPSHOT_DIRECTORY, name)
+    temporary_directory = f"{snapshot_directory}.tmp"
+    os.makedirs(temporary_directory)
+    try:
+        for frame_name, df in frames.items():
+            write_frame(df, os.path.join(temporary_directory, f"{frame_name}.feather"))
+        with open(os.path.join(temporary_directory, MANIFEST_FILE_NAME), 'w') as manifest_file:
+            json.dump({'version': version, 'frames': list(frames.keys()), 'metadata': metadata,
+                       'created_at': time.time()}, manifest_file)
+    except Exception as e:
+        log.error(f"Unable to save the data snapshot. Reason: {e}")
+        shutil.rmtree(temporary_directory, ignore_errors=True)
+        return None
+
+    # Files of a published snapshot never change, a new version is always written in a new directory
+    os.rename(temporary_directory, snapshot_directory)
+    publish_snapshot_name(name)
+    remove_old_snapshots(name)
+    log.info(f"Data snapshot {name} saved in {round(time.time() - start_time, 2)} seconds")
+    return name
+
+
+def load_snapshot(name=None):
+    """Return the name, the DataFrames and the metadata of a snapshot, by default the one currently published, or None
+    if there is no usable snapshot"""
+    start_time = time.time()
+    name = name or read_current_snapshot_name()
+    if name is None:
+        log.info("No data snapshot available")
+        return None
+    snapshot_directory = os.path.join(SNAPSHOT_DIRECTORY, name)
+    try:
+        with open(os.path.join(snapshot_directory, MANIFEST_FILE_NAME), 'r') as manifest_file:
+            manifest = json.load(manifest_file)
+        frames = {frame_name: read_frame(os.path.join(snapshot_directory, f"{frame_name}.feather"))
+                  for frame_name in manifest['frames']}
+    except Exception as e:
+        log.error(f"Unable to load the data snapshot {name}. Reason: {e}")
+        return None
+    log.info(f"Data snapshot {name} loaded in {round(time.time() - start_time, 2)} seconds")
+    return name, frames, {**manifest['metadata'], 'data_version': manifest['version']}
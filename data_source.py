@@ -0,0 +1,153 @@
+import abc
+import datetime
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import http_cache
+import logger
+from constants import MAX_CONCURRENT_DOWNLOADS, LIST_OF_APPEND_ONLY_URLS, DATA_SOURCE_ENV_VAR, \
+    DATA_SOURCE_LOCATION_ENV_VAR, DATA_SOURCE_REPLAY_TIME_ENV_VAR, DATA_SOURCE_RECORD_DIRECTORY_ENV_VAR, \
+    RECORD_TIMESTAMP_FORMAT
+from http_cache import FetchResult
+from utils import get_environment_variable
+
+log = logger.get_logger()
+
+
+def get_file_name(url):
+    return os.path.basename(urlparse(url).path)
+
+
+class DataSource(abc.ABC):
+    """Where the data files are read from. Loaders always use the original URLs defined in constants"""
+
+    @abc.abstractmethod
+    def fetch(self, url, append_only=False):
+        """Return the FetchResult of url, None if it could not be read"""
+
+    def timed_fetch(self, url):
+        start_time = time.time()
+        fetch_result = self.fetch(url, url in LIST_OF_APPEND_ONLY_URLS)
+        log.info(f"Fetch of {url} has taken {round(time.time() - start_time, 2)} seconds")
+        return fetch_result
+
+    def fetch_all(self, urls):
+        """Fetch all the urls concurrently and return a dict url -> FetchResult (None for failed requests)"""
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS, thread_name_prefix="fetch-thread") as executor:
+            fetch_results = dict(zip(urls, executor.map(self.timed_fetch, urls)))
+        log.info(f"Fetch of {len(urls)} sources has taken {round(time.time() - start_time, 2)} seconds")
+        return fetch_results
+
+
+class WebDataSource(DataSource):
+
+    def __init__(self, record_directory=None):
+        # When set, every new version downloaded is copied in record_directory/<timestamp>/<file name>
+        self.record_directory = record_directory
+
+    def fetch(self, url, append_only=False):
+        fetch_result = http_cache.fetch(url, append_only)
+        if fetch_result is not None and fetch_result.modified and self.record_directory:
+            self.record(url, fetch_result)
+        return fetch_result
+
+    def record(self, url, fetch_result):
+        timestamp = datetime.datetime.utcnow().strftime(RECORD_TIMESTAMP_FORMAT)
+        record_path = os.path.join(self.record_directory, timestamp, get_file_name(url))
+        os.makedirs(os.path.dirname(record_path), exist_ok=True)
+        shutil.copyfile(fetch_result.body_path, record_path)
+        log.info(f"Recorded new version of {url} in {record_path}")
+
+    def __str__(self):
+        return "web"
+
+
+class HttpStubDataSource(WebDataSource):
+
+    def __init__(self, base_url, record_directory=None):
+        super().__init__(record_directory)
+        self.base_url = base_url.rstrip('/')
+
+    def fetch(self, url, append_only=False):
+        # The stub serves every file from its root using the file name of the original URL
+        fetch_result = super().fetch(f"{self.base_url}/{get_file_name(url)}", append_only)
+        if fetch_result is not None:
+            fetch_result.url = url
+        return fetch_result
+
+    def __str__(self):
+        return f"HTTP stub at {self.base_url}"
+
+
+class LocalDirectoryDataSource(DataSource):
+    """Read files from a directory, either directly or from subdirectories named after the time they were recorded.
+
+    With recorded versions, each file is read from the most recent subdirectory not later than replay_time.
+    """
+
+    def __init__(self, directory, replay_time=None):
+        self.directory = directory
+        self.replay_time = replay_time
+        self.last_versions = {}
+
+    def get_recorded_timestamps(self):
+        timestamps = []
+        for name in os.listdir(self.directory):
+            try:
+                datetime.datetime.strptime(name, RECORD_TIMESTAMP_FORMAT)
+            except ValueError:
+                continue
+            timestamps.append(name)
+        return sorted(timestamps)
+
+    def set_replay_time(self, replay_time):
+        self.replay_time = replay_time
+
+    def find_file(self, url):
+        file_name = get_file_name(url)
+        for timestamp in reversed(self.get_recorded_timestamps()):
+            path = os.path.join(self.directory, timestamp, file_name)
+            if (self.replay_time is None or timestamp <= self.replay_time) and os.path.exists(path):
+                return path, timestamp
+        path = os.path.join(self.directory, file_name)
+        if os.path.exists(path):
+            file_stat = os.stat(path)
+            return path, f"{file_stat.st_mtime_ns}-{file_stat.st_size}"
+        return None, None
+
+    def fetch(self, url, append_only=False):
+        path, version = self.find_file(url)
+        if path is None:
+            log.error(f"No local file available for URL: {url}")
+            return None
+        modified = self.last_versions.get(url) != version
+        self.last_versions[url] = version
+        return FetchResult(url, path, version, modified)
+
+    def __str__(self):
+        return f"local directory {self.directory} (replay time: {self.replay_time})"
+
+
+def create_data_source():
+    data_source_type = get_environment_variable(DATA_SOURCE_ENV_VAR).lower()
+    location = get_environment_variable(DATA_SOURCE_LOCATION_ENV_VAR)
+    record_directory = get_environment_variable(DATA_SOURCE_RECORD_DIRECTORY_ENV_VAR) or None
+    if data_source_type == 'local':
+        data_source = LocalDirectoryDataSource(location, get_environment_variable(DATA_SOURCE_REPLAY_TIME_ENV_VAR)
+                                               or None)
+    elif data_source_type == 'stub':
+        data_source = HttpStubDataSource(location, record_directory)
+    else:
+        if data_source_type not in ('', 'web'):
+            log.error(f"{DATA_SOURCE_ENV_VAR} was not set correctly, it expect web, stub or local as value. Setting "
+                      f"web as default")
+        data_source = WebDataSource(record_directory)
+    log.info(f"Data is loaded from: {data_source}")
+    return data_source
+
+
+data_source = create_data_source()
@@ -0,0 +1,34 @@
+from types import MappingProxyType
+
+
+class DataState:
+    """Immutable set of all the datasets served by the application, built by one data refresh.
+
+    A refresh builds a new state next to the current one and publishes it replacing a single reference, so a
+    callback reading one state never mixes datasets of different refreshes. The version grows by one at every
+    refresh which changes some data and can be used as cache key.
+    """
+
+    __slots__ = ('version', 'datasets', 'content_versions', 'last_check_for_update')
+
+    def __init__(self, version=0, datasets=None, content_versions=None, last_check_for_update=None):
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'datasets', MappingProxyType(dict(datasets or {})))
+        # Content versions of the sources and of the datasets derived from them, see data_pipeline
+        object.__setattr__(self, 'content_versions', MappingProxyType(dict(content_versions or {})))
+        object.__setattr__(self, 'last_check_for_update', last_check_for_update)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"DataState is immutable, unable to set {name}")
+
+    def __getattr__(self, name):
+        # Datasets are read as attributes, e.g. state.df_national_data
+        try:
+            return self.datasets[name]
+        except KeyError:
+            raise AttributeError(f"No dataset {name} in data state version {self.version}") from None
+
+    def update(self, data_updates, content_versions, last_check_for_update):
+        """Return a new state with the datasets updated, the version grows only if some data changed"""
+        version = self.version + 1 if data_updates or content_versions != self.content_versions else self.version
+        return DataState(version, {**self.datasets, **data_updates}, content_versions, last_check_for_update)
@@ -4,7 +4,7 @@ from dash import html, dcc
 
 import constants
 import logger
-from constants import SECONDS_FOR_NEWS_UPDATE, PAGE_TITLE, LIST_OF_WORLD_FIELDS
+from constants import SECONDS_FOR_NEWS_UPDATE, PAGE_TITLE, LIST_OF_WORLD_FIELDS, LIST_OF_ITALY_FIELDS
 from resources import language_list, load_resource, locale_language
 from utils import get_options, get_version, style_vaccines_italy_tab, \
     style_vaccines_italy_herd_immunity
@@ -14,14 +14,6 @@ encoded_image_nicola = base64.b64encode(open('assets/nicola.png', 'rb').read()).
 
 log = logger.get_logger()
 
-italian_field_list_complete = ['ricoverati_con_sintomi', 'terapia_intensiva',
-                               'totale_ospedalizzati', 'isolamento_domiciliare',
-                               'totale_positivi', 'variazione_totale_positivi',
-                               'nuovi_positivi', 'dimessi_guariti',
-                               'deceduti', 'casi_da_sospetto_diagnostico', 'casi_da_screening', 'totale_casi',
-                               'tamponi', 'casi_testati']
-
-
 def create_page_components(app, df_regional_data, df_country_world_data):
     log.info("Loading all the components")
     return [
@@ -397,7 +389,7 @@ def create_italy_tab(df_regional_data):
                                                dcc.Dropdown(
                                                    id='dropdown_italy_data_selected',
                                                    options=get_options_from_list(
-                                                       italian_field_list_complete),
+                                                       LIST_OF_ITALY_FIELDS),
                                                    multi=False,
                                                    value='nuovi_positivi',
                                                    className='dcc_control'
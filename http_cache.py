@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import shutil
+
+import requests
+
+import logger
+from http_client import http_client
+from constants import HTTP_CACHE_DIRECTORY, APPEND_CHECK_TAIL_BYTES, DOWNLOAD_CHUNK_BYTES
+
+log = logger.get_logger()
+
+
+class FetchResult:
+
+    def __init__(self, url, body_path, version, modified, appended_content=None, previous_version=None):
+        self.url = url
+        # The body is kept on disk, large sources can then be parsed in chunks without loading them in memory
+        self.body_path = body_path
+        # ETag or Last-Modified of the source, used in place of the old Content-Length check
+        self.version = version
+        self.modified = modified
+        # Set only when the new content was obtained appending bytes to the cached content of previous_version
+        self.appended_content = appended_content
+        self.previous_version = previous_version
+
+    @property
+    def content(self):
+        with open(self.body_path, 'rb') as body_file:
+            return body_file.read()
+
+    def __str__(self):
+        return f"URL: {self.url}, version: {self.version}, modified: {self.modified}"
+
+
+def get_cache_key(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def get_cache_paths(url):
+    key = get_cache_key(url)
+    return os.path.join(HTTP_CACHE_DIRECTORY, f"{key}.json"), os.path.join(HTTP_CACHE_DIRECTORY, f"{key}.body")
+
+
+def read_cache_metadata(url):
+    metadata_path, body_path = get_cache_paths(url)
+    if not os.path.exists(metadata_path) or not os.path.exists(body_path):
+        return None
+    with open(metadata_path, 'r') as metadata_file:
+        return json.load(metadata_file)
+
+
+def write_cache_metadata(url, metadata):
+    metadata_path, _ = get_cache_paths(url)
+    with open(f"{metadata_path}.tmp", 'w') as metadata_file:
+        json.dump(metadata, metadata_file)
+    os.replace(f"{metadata_path}.tmp", metadata_path)
+
+
+def read_file_tail(path, size):
+    with open(path, 'rb') as body_file:
+        body_file.seek(max(os.path.getsize(path) - size, 0))
+        return body_file.read()
+
+
+def get_file_checksum(path):
+    checksum = hashlib.sha1()
+    with open(path, 'rb') as body_file:
+        for chunk in iter(lambda: body_file.read(DOWNLOAD_CHUNK_BYTES), b''):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def create_conditional_headers(metadata):
+    headers = {'Accept-Encoding': 'gzip'}
+    if metadata is None:
+        return headers
+    if metadata.get('etag'):
+        headers['If-None-Match'] = metadata['etag']
+    if metadata.get('last_modified'):
+        headers['If-Modified-Since'] = metadata['last_modified']
+    return headers
+
+
+def can_fetch_appended_content(metadata, body_path):
+    # Only complete rows can be extended, and the tail used for the check must be inside the cached content
+    return metadata is not None and 'tail_checksum' in metadata and metadata['length'] > APPEND_CHECK_TAIL_BYTES \
+        and read_file_tail(body_path, 1) == b'\n'
+
+
+def get_appended_content(resp, metadata):
+    """Return the bytes appended after the cached content, or None if the response does not extend it"""
+    content_range = resp.headers.get('Content-Range', '')
+    total_length = content_range.rsplit('/', 1)[-1]
+    if not total_length.isdigit() or int(total_length) < metadata['length']:
+        return None
+    # A new validator without new bytes means that an older row was edited keeping the same length
+    validators = (resp.headers.get('ETag'), resp.headers.get('Last-Modified'))
+    if int(total_length) == metadata['length'] and any(validators) \
+            and validators != (metadata['etag'], metadata['last_modified']):
+        return None
+    # The response starts with the last bytes we already have: if they changed, older rows were edited
+    if hashlib.sha1(resp.content[:APPEND_CHECK_TAIL_BYTES]).hexdigest() != metadata['tail_checksum']:
+        return None
+    return resp.content[APPEND_CHECK_TAIL_BYTES:]
+
+
+def download_body(resp, body_path):
+    # Written to a temporary file and renamed, so a crash never leaves a half written body on disk
+    with open(f"{body_path}.tmp", 'wb') as body_file:
+        for chunk in resp.iter_content(DOWNLOAD_CHUNK_BYTES):
+            body_file.write(chunk)
+    os.replace(f"{body_path}.tmp", body_path)
+
+
+def append_body(appended_content, body_path):
+    shutil.copyfile(body_path, f"{body_path}.tmp")
+    with open(f"{body_path}.tmp", 'ab') as body_file:
+        body_file.write(appended_content)
+    os.replace(f"{body_path}.tmp", body_path)
+
+
+def store_fetch_result(url, resp, body_path, appended_content=None, previous_version=None):
+    # Some sources do not send any validator, in that case the content hash is used as version
+    etag = resp.headers.get('ETag')
+    last_modified = resp.headers.get('Last-Modified')
+    version = etag or last_modified or get_file_checksum(body_path)
+    metadata = {'url': url, 'etag': etag, 'last_modified': last_modified, 'version': version,
+                'length': os.path.getsize(body_path),
+                'tail_checksum': hashlib.sha1(read_file_tail(body_path, APPEND_CHECK_TAIL_BYTES)).hexdigest()}
+    write_cache_metadata(url, metadata)
+    return FetchResult(url, body_path, version, True, appended_content, previous_version)
+
+
+def fetch(url, append_only=False):
+    """Download url only if it changed since the last call, otherwise return the body cached on disk.
+
+    With append_only, only the bytes added after the cached content are downloaded using a Range request.
+    """
+    os.makedirs(HTTP_CACHE_DIRECTORY, exist_ok=True)
+    _, body_path = get_cache_paths(url)
+    metadata = read_cache_metadata(url)
+    headers = create_conditional_headers(metadata)
+    is_range_request = append_only and can_fetch_appended_content(metadata, body_path)
+    if is_range_request:
+        headers['Range'] = f"bytes={metadata['length'] - APPEND_CHECK_TAIL_BYTES}-"
+        # Byte ranges have to refer to the plain content and not to its gzip encoding
+        headers['Accept-Encoding'] = 'identity'
+    try:
+        resp = http_client.get(url, headers=headers, stream=True)
+        if resp.status_code != 200:
+            # A streamed response gives its connection back to the pool only once the body has been read
+            resp.content
+        if resp.status_code == 304:
+            log.info(f"Source not modified since last check: {url}")
+            return FetchResult(url, body_path, metadata['version'], False)
+        elif resp.status_code == 206 and is_range_request:
+            appended_content = get_appended_content(resp, metadata)
+            if appended_content is None:
+                log.info(f"Source was modified before its last known row, downloading it entirely: {url}")
+                return fetch(url)
+            append_body(appended_content, body_path)
+            log.info(f"Source extended: {url} ({len(appended_content)} new bytes)")
+            return store_fetch_result(url, resp, body_path, appended_content, metadata['version'])
+        elif is_range_request and resp.status_code != 200:
+            # E.g. 416 when the source shrank below the cached content: the range would fail at every check
+            log.info(f"Range request refused with status code {resp.status_code}, downloading it entirely: {url}")
+            return fetch(url)
+        elif resp.status_code != 200:
+            log.error(f"Request failed trying to contact URL: {url}. Status code: {resp.status_code}")
+            return None
+        download_body(resp, body_path)
+    except requests.RequestException as e:
+        log.error(f"Request failed trying to contact URL: {url}. Reason: {e}")
+        return None
+
+    log.info(f"Source downloaded: {url} ({os.path.getsize(body_path)} bytes)")
+    return store_fetch_result(url, resp, body_path)
+
@@ -0,0 +1,103 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import logger
+from constants import HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS, HTTP_MAX_RETRIES, \
+    HTTP_BACKOFF_SECONDS, HTTP_MAX_BACKOFF_SECONDS, HTTP_POOL_SIZE
+
+log = logger.get_logger()
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Requests which change something on the server (e.g. sending a notification) are never repeated
+RETRY_METHODS = ('GET', 'HEAD')
+
+
+def get_backoff_delay(attempt):
+    # Exponential backoff with jitter, so that failed requests sent together are not retried together
+    delay = min(HTTP_MAX_BACKOFF_SECONDS, HTTP_BACKOFF_SECONDS * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
+
+
+class HttpClient:
+    """Process wide HTTP client: connections to the same host are kept alive and reused by all the requests"""
+
+    def __init__(self, timeout=(HTTP_CONNECT_TIMEOUT_SECONDS, HTTP_READ_TIMEOUT_SECONDS),
+                 max_retries=HTTP_MAX_RETRIES, pool_size=HTTP_POOL_SIZE):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+        self.metrics_lock = threading.Lock()
+        self.response_count = 0
+        self.retry_count = 0
+        self.failure_count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record_latency(self, latency):
+        with self.metrics_lock:
+            self.response_count += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def request(self, method, url, **kwargs):
+        """Same arguments of requests.request. Connection errors and temporary server errors are retried"""
+        kwargs.setdefault('timeout', self.timeout)
+        max_retries = self.max_retries if method.upper() in RETRY_METHODS else 0
+        for attempt in range(max_retries + 1):
+            start_time = time.time()
+            try:
+                resp = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                with self.metrics_lock:
+                    self.failure_count += 1
+                if attempt == max_retries:
+                    raise
+                reason = e
+            else:
+                # With stream=True this is the time to receive the headers
+                self.record_latency(time.time() - start_time)
+                if resp.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+                    return resp
+                resp.close()
+                reason = f"status code {resp.status_code}"
+            delay = get_backoff_delay(attempt)
+            with self.metrics_lock:
+                self.retry_count += 1
+            log.warning(f"Request to {url} failed ({reason}), retrying in {round(delay, 2)} seconds")
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def get_metrics(self):
+        # Every request served by a connection already open is a hit of the connection pool
+        pool_requests = 0
+        pool_connections = 0
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                pool_requests += pool.num_requests
+                pool_connections += pool.num_connections
+        with self.metrics_lock:
+            return {'responses': self.response_count,
+                    'retries': self.retry_count,
+                    'failures': self.failure_count,
+                    'connections_opened': pool_connections,
+                    'pool_hit_rate': round(1 - pool_connections / pool_requests, 3) if pool_requests else None,
+                    'average_latency_seconds':
+                        round(self.total_latency / self.response_count, 3) if self.response_count else None,
+                    'max_latency_seconds': round(self.max_latency, 3)}
+
+
+http_client = HttpClient()
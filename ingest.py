@@ -0,0 +1,227 @@
+"""Ingestion of the data: checks the data sources, computes the datasets and publishes every new data version as a
+snapshot, which the web application only reads.
+
+Usage:
+    python -m ingest run     check the data sources on schedule and send the daily notification
+    python -m ingest once    check the data sources once and exit
+"""
+import argparse
+import datetime
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytz
+
+import logger
+from constants import LIST_OF_DATA_SOURCE_URLS, REFRESH_SUBPROCESS_TIMEOUT_SECONDS
+from data_pipeline import data_pipeline
+from data_snapshot import load_snapshot, read_current_snapshot_name, save_snapshot
+from data_source import data_source
+from data_state import DataState
+from http_client import http_client
+from leader_election import leader_election
+from resources import start_translation
+from scheduler import scheduler
+from source_polling import PollingTrigger, source_polling
+from utils import is_debug_mode_enabled, send_one_signal_notification, \
+    send_one_signal_notification_for_dataframe_update
+
+log = logger.get_logger()
+
+# Notification sent when the content version of a source changes
+notifications_for_data_update = {
+    'national_data': ('notification_text_repo_pandemic_data_ita_updated', 'Italy data update'),
+    'country_world_data': ('notification_text_repo_pandemic_data_world_updated', 'World data update'),
+    'vaccines_italy_summary': ('notification_text_repo_vaccines_data_ita_updated', 'Vaccine data update')
+}
+
+
+def get_last_data_check():
+    last_check_update = datetime.datetime.now(pytz.timezone('Europe/Rome')).strftime(" %d/%m/%Y %H:%M:%S")
+    return last_check_update
+
+
+def load_data_state_from_snapshot(name=None, restore=True):
+    """Return the name of a snapshot, by default the one currently published, and its data state. None if there is no
+    usable snapshot. With restore the datasets which are not persisted (e.g. cubes) are computed again"""
+    snapshot = load_snapshot(name)
+    # A snapshot saved by a different version of the application could miss some of the DataFrames
+    if snapshot is None or set(snapshot[1].keys()) != set(data_pipeline.frame_names):
+        return None
+    name, frames, metadata = snapshot
+    datasets = {**frames, **data_pipeline.restore(frames)} if restore else frames
+    return name, DataState(metadata['data_version'], datasets, metadata['data_versions'],
+                           metadata['last_check_for_update'])
+
+
+class DataIngest:
+    """Keeps a data state up to date with the data sources and saves a snapshot of every new data version.
+
+    With serve_data the datasets only used to serve the data (cubes, rankings, cards) are computed too, when the
+    ingestion runs inside the web application. on_publish is called with every new data state.
+    With use_subprocess the data are refreshed by a child process, see refresh_in_subprocess.
+    """
+
+    def __init__(self, serve_data=False, on_publish=None, notify=True, use_subprocess=False):
+        self.serve_data = serve_data
+        self.on_publish = on_publish
+        self.notify = notify
+        self.use_subprocess = use_subprocess
+        self.state = DataState()
+        self.snapshot_name = None
+        # Only one refresh at a time builds the next state, so no refresh overwrites the data of another one
+        self.refresh_lock = threading.Lock()
+
+    def publish(self, state):
+        self.state = state
+        if self.on_publish is not None:
+            self.on_publish(state)
+
+    def load_at_boot(self):
+        """Load the data from the snapshot published, or from the data sources if there is no usable snapshot.
+        Return True if the data were loaded from the snapshot, which could be outdated"""
+        with self.refresh_lock:
+            snapshot = load_data_state_from_snapshot(restore=self.serve_data)
+            if snapshot is not None:
+                self.snapshot_name, state = snapshot
+                self.publish(state)
+                log.info(f'Data version {state.version} loaded from snapshot {self.snapshot_name}')
+                return True
+        self.refresh()
+        return False
+
+    def refresh(self, due_only=False):
+        """Check the data sources, with due_only only the ones due according to their polling cadence"""
+        with self.refresh_lock:
+            # The sources due only update the datasets built from them, a state missing the others is never built
+            if due_only and not self.state.datasets:
+                log.info('No data loaded yet, the data sources due are not checked')
+                return
+            # Checked once the previous refresh ended, which could have checked the same sources
+            urls = source_polling.get_due_urls() if due_only else LIST_OF_DATA_SOURCE_URLS
+            if not urls:
+                log.info('No data source has to be checked')
+                return
+            log.info(f'Start scheduled task to check data updates of {len(urls)} sources')
+            start_time = time.time()
+            state = self.state
+            new_state = self.refresh_in_subprocess(state, due_only) if self.use_subprocess \
+                else self.refresh_in_process(state, urls)
+        if self.notify:
+            self.send_notifications_for_data_update(state, new_state)
+        log.info(f'Update task completed at: {new_state.last_check_for_update} (data version {new_state.version}) '
+                 f'in {round(time.time() - start_time, 2)} seconds')
+        log.info(f'HTTP client metrics: {http_client.get_metrics()}')
+
+    def refresh_due_sources(self):
+        self.refresh(due_only=True)
+
+    def refresh_in_process(self, state, urls):
+        fetch_results = data_source.fetch_all(urls)
+        source_polling.fetch_log.record(fetch_results)
+        data_updates, versions = data_pipeline.refresh(fetch_results, state.datasets, state.content_versions,
+                                                       persisted_only=not self.serve_data)
+        new_state = state.update(data_updates, versions, get_last_data_check())
+        missing_frames = [name for name in data_pipeline.frame_names if name not in new_state.datasets]
+        if missing_frames:
+            log.error(f"Data version {new_state.version} not published, missing the datasets {missing_frames}")
+            return state
+        # The snapshot is saved before the state is published, so the data served always match the snapshot
+        if new_state.version != state.version:
+            snapshot_name = save_snapshot({name: new_state.datasets[name] for name in data_pipeline.frame_names},
+                                          {'data_versions': dict(new_state.content_versions),
+                                           'last_check_for_update': new_state.last_check_for_update},
+                                          new_state.version)
+            if snapshot_name is None:
+                return state
+            self.snapshot_name = snapshot_name
+        self.publish(new_state)
+        return new_state
+
+    def refresh_in_subprocess(self, state, due_only):
+        """Refresh the data running 'python -m ingest once' in a child process, which ships the DataFrames back as a
+        memory-mapped snapshot: the downloads and the pandas work never hold the GIL of the process serving requests.
+        The child process starts from the last snapshot and the HTTP cache, so the sources are refreshed incrementally
+        """
+        # Notifications are sent by this process, which has the translations of the resources
+        try:
+            completed_process = subprocess.run([sys.executable, '-m', 'ingest', 'once', '--no-notifications']
+                                               + (['--due-only'] if due_only else []),
+                                               cwd=os.path.dirname(os.path.abspath(__file__)),
+                                               timeout=REFRESH_SUBPROCESS_TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            # The child process is killed, the snapshot it was writing is never published
+            log.error(f"Refresh subprocess killed after {REFRESH_SUBPROCESS_TIMEOUT_SECONDS} seconds")
+            return state
+        if completed_process.returncode != 0:
+            log.error(f"Unable to refresh the data in the refresh subprocess, exit code {completed_process.returncode}")
+            return state
+        snapshot_name = read_current_snapshot_name()
+        if snapshot_name == self.snapshot_name:
+            new_state = state.update({}, state.content_versions, get_last_data_check())
+        else:
+            snapshot = load_data_state_from_snapshot(snapshot_name, restore=self.serve_data)
+            if snapshot is None:
+                log.error(f"Unable to load the snapshot {snapshot_name} of the refresh subprocess")
+                return state
+            self.snapshot_name, new_state = snapshot
+        self.publish(new_state)
+        return new_state
+
+    def send_notifications_for_data_update(self, previous_state, new_state):
+        for name, (resource_key, notification_type) in notifications_for_data_update.items():
+            if new_state.content_versions.get(name) != previous_state.content_versions.get(name):
+                send_one_signal_notification_for_dataframe_update(resource_key, notification_type,
+                                                                  previous_state.content_versions.get(name, 0))
+
+    def send_daily_italian_notification(self):
+        if not self.notify:
+            return
+        df_national_data = self.state.df_national_data
+        new_positives = df_national_data['nuovi_positivi'].iloc[-1]
+        date_string = df_national_data.iloc[-1]['data'].strftime('%d/%m/%Y')
+        # We are assuming the dataset is updated every day, we could check or add the last date in the message
+        send_one_signal_notification("notification_text_daily_italian_update", "Italy daily update", date_string,
+                                     new_positives)
+
+
+def schedule_jobs(data_ingest):
+    # Each source is checked at its own cadence, learned from the times it was published, see SourcePolling
+    scheduler.add_job('data_refresh', data_ingest.refresh_due_sources, [PollingTrigger(source_polling)])
+    scheduler.add_job('daily_italian_notification', data_ingest.send_daily_italian_notification,
+                      [scheduler.daily_at("21:00")])
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(prog='python -m ingest', description='Publish the data snapshots read by the '
+                                                                          'web application')
+    parser.add_argument('command', choices=['run', 'once'],
+                        help='run: check the data sources on schedule, once: check them once and exit')
+    parser.add_argument('--no-notifications', action='store_true', help='do not send any notification')
+    parser.add_argument('--due-only', action='store_true',
+                        help='check only the data sources due according to their polling cadence')
+    arguments = parser.parse_args(arguments)
+    threading.current_thread().name = "ingest-thread"
+    logger.initialize_logger()
+
+    notify = not arguments.no_notifications
+    # Notifications are sent in every language, translated before any notification can be sent
+    if notify and not is_debug_mode_enabled():
+        start_translation()
+    # Only one process runs the scheduled jobs, waiting for the current leader (e.g. a web worker) to stop
+    if arguments.command == 'run' and not leader_election.acquire():
+        log.info('Waiting to become the leader running the scheduled jobs')
+        leader_election.acquire(blocking=True)
+    data_ingest = DataIngest(notify=notify)
+    if data_ingest.load_at_boot():
+        data_ingest.refresh(due_only=arguments.due_only)
+    if arguments.command == 'run':
+        schedule_jobs(data_ingest)
+        scheduler.run()
+
+
+if __name__ == '__main__':
+    main()
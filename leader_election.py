@@ -0,0 +1,47 @@
+import fcntl
+import os
+
+import logger
+from constants import LEADER_LOCK_FILE
+
+log = logger.get_logger()
+
+
+class LeaderElection:
+    """Election of a single leader among the processes sharing a lock file, e.g. the gunicorn workers.
+
+    The leader holds an exclusive lock on the file as long as it lives. The operating system releases the lock when
+    the process dies, so another process wins the next election. The lock must be acquired after the fork of the
+    workers, the processes forked from the leader would share its lock.
+    """
+
+    def __init__(self, lock_path):
+        self.lock_path = lock_path
+        self.lock_file = None
+
+    @property
+    def is_leader(self):
+        return self.lock_file is not None
+
+    def acquire(self, blocking=False):
+        """Return True if this process is the leader, without blocking returns False if another process is"""
+        if self.lock_file is not None:
+            return True
+        os.makedirs(os.path.dirname(self.lock_path) or '.', exist_ok=True)
+        lock_file = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        # The pid of the leader is only written to help finding it, the lock alone decides the leader
+        lock_file.truncate(0)
+        lock_file.write(f"{os.getpid()}\n")
+        lock_file.flush()
+        self.lock_file = lock_file
+        log.info(f"Process {os.getpid()} elected leader with lock {self.lock_path}")
+        return True
+
+
+# Leader among the processes sharing the data snapshots: it owns the scheduled jobs and publishes the snapshots
+leader_election = LeaderElection(LEADER_LOCK_FILE)
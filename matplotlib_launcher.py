@@ -2,6 +2,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
+from time_series import calculate_daily_values
+
 """ Column names for National Data
 ['data' 'stato' 'ricoverati_con_sintomi' 'terapia_intensiva'
  'totale_ospedalizzati' 'isolamento_domiciliare' 'totale_positivi'
@@ -101,25 +103,11 @@ def configure_mainplot_with_subplots():
 
 
 def calculate_and_add_daily_variance_of_dimessi(national_data):
-    list_dimessi = national_data['dimessi_guariti'].values.tolist()
-    list_dimessi_giornalieri = []
-    for i in range(len(list_dimessi)):
-        if i == 0:
-            list_dimessi_giornalieri.append(0)
-        else:
-            list_dimessi_giornalieri.append(list_dimessi[i] - list_dimessi[i - 1])
-    national_data['dimessi_giornalieri'] = list_dimessi_giornalieri
+    national_data['dimessi_giornalieri'] = calculate_daily_values(national_data['dimessi_guariti'])
 
 
 def calculate_and_add_daily_variance_of_tamponi(national_data):
-    list_tamponi = national_data['tamponi'].values.tolist()
-    list_tamponi_giornalieri = []
-    for i in range(len(list_tamponi)):
-        if i == 0:
-            list_tamponi_giornalieri.append(0)
-        else:
-            list_tamponi_giornalieri.append(list_tamponi[i] - list_tamponi[i - 1])
-    national_data['tamponi_giornalieri'] = list_tamponi_giornalieri
+    national_data['tamponi_giornalieri'] = calculate_daily_values(national_data['tamponi'])
 
 
 def run_application():
@@ -1,6 +1,6 @@
 import json
-import requests
 
+from http_client import http_client
 from resources import create_resource_dict_for_languages
 
 onesignal_js_init_template = '''
@@ -63,7 +63,7 @@ class OneSignal:
                    "included_segments": ["Subscribed Users"],
                    "contents": message_content}
 
-        req = requests.post("https://onesignal.com/api/v1/notifications", headers=header, data=json.dumps(payload))
+        req = http_client.post("https://onesignal.com/api/v1/notifications", headers=header, data=json.dumps(payload))
         return req
 
     def create_onesignal_js_init(self):
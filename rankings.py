@@ -0,0 +1,34 @@
+import pandas as pd
+
+from utils import format_value_string_to_locale
+
+
+class Rankings:
+    """Entities of a table sorted by each metric from the highest value, with the values already formatted for display.
+
+    Built once for each version of the data, so that the callbacks only look the order up.
+    """
+
+    def __init__(self, df, entity_column, metrics):
+        self.entities = {}
+        self.formatted_values = {}
+        self.ranks = {}
+        for metric in metrics:
+            # A stable sort keeps the order of the table for entities with the same value
+            df_sorted = df.sort_values(by=[metric], ascending=False, kind='mergesort')
+            entities = df_sorted[entity_column].tolist()
+            self.entities[metric] = entities
+            self.formatted_values[metric] = pd.to_numeric(df_sorted[metric], downcast='float') \
+                .apply(format_value_string_to_locale).tolist()
+            self.ranks[metric] = {entity: rank for rank, entity in enumerate(entities, start=1)}
+
+    def get_top(self, metric, count):
+        """Entities with the highest values of the metric, from the highest"""
+        return self.entities[metric][:count]
+
+    def get_rank(self, metric, entity):
+        return self.ranks[metric].get(entity)
+
+    def get_table(self, metric):
+        """Entities sorted by the metric and their formatted values"""
+        return self.entities[metric], self.formatted_values[metric]
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+import logger
+
+log = logger.get_logger()
+
+
+class ReferenceTable:
+    """Values of reference data (e.g. population) indexed by a key, like a region or country name.
+
+    With a date column a key can have more values, each one valid from its date until the next one: rows are then
+    joined as of their own date.
+    """
+
+    def __init__(self, name, df, key_column, value_column, date_column=None):
+        self.name = name
+        self.value_column = value_column
+        self.date_column = date_column
+        duplicated_rows = df[df.duplicated([key_column] + ([date_column] if date_column else []))]
+        if not duplicated_rows.empty:
+            raise ValueError(f"Reference data {name} has more values for: {duplicated_rows[key_column].tolist()}")
+        if date_column is None:
+            self.values = df.set_index(key_column)[value_column]
+        else:
+            self.values = df.rename(columns={key_column: 'key', date_column: 'date'}).sort_values(by=['date'])
+        self.keys = set(df[key_column])
+        # Keys without values already logged, so that each mismatch is reported once
+        self.reported_keys = set()
+
+    def report_unknown_keys(self, keys, key_column):
+        unknown_keys = {key for key in keys if key not in self.keys} - self.reported_keys
+        if unknown_keys:
+            log.warning(f"Reference data {self.name} has no value for {key_column} {sorted(map(str, unknown_keys))}")
+            self.reported_keys.update(unknown_keys)
+
+    def join_values(self, df, key_column, date_column=None):
+        """Values for every row of df joined on key_column, and as of date_column for dated data. NaN when missing"""
+        entity_codes, entities = pd.factorize(df[key_column])
+        entities = np.asarray(entities, dtype=object)
+        self.report_unknown_keys(entities, key_column)
+        if self.date_column is None:
+            # Looked up once per key and spread to the rows by their key code
+            values = self.values.reindex(entities).to_numpy(dtype='float64')
+            return np.append(values, np.nan)[entity_codes]
+        df_keys = pd.DataFrame({'key': entities[entity_codes] if len(entities) else np.array([], dtype=object),
+                                'date': df[date_column].to_numpy(), 'position': np.arange(len(df))})
+        df_joined = pd.merge_asof(df_keys.sort_values(by=['date']), self.values, on='date', by='key',
+                                  direction='backward')
+        return df_joined.sort_values(by=['position'])[self.value_column].to_numpy(dtype='float64')
+
+
+class ReferenceDataRegistry:
+    """Reference data loaded once from the assets, typed and indexed, by name"""
+
+    def __init__(self):
+        self.tables = {}
+
+    def register(self, name, path, key_column, value_column, dtype, date_column=None):
+        # Assets have no header: one row per key (and date) with its value
+        columns = [key_column] + ([date_column] if date_column else []) + [value_column]
+        df = pd.read_csv(path, header=None, names=columns, dtype=dtype,
+                         parse_dates=[date_column] if date_column else False)
+        if df[value_column].isna().any():
+            raise ValueError(f"Reference data {name} has no value for: {df[df[value_column].isna()][key_column].tolist()}")
+        table = ReferenceTable(name, df, key_column, value_column, date_column)
+        self.tables[name] = table
+        log.info(f"Reference data {name} loaded from {path}: {len(df)} values")
+        return table
+
+    def get(self, name):
+        return self.tables[name]
+
+
+reference_data = ReferenceDataRegistry()
@@ -0,0 +1,150 @@
+import datetime
+import threading
+import time
+
+import pytz
+
+import logger
+from constants import SCHEDULER_COALESCE_SECONDS, SCHEDULER_TIMEZONE
+
+log = logger.get_logger()
+
+
+class DailyTrigger:
+    """Fires every day at a time of the day ('HH:MM') in the timezone of the scheduler"""
+
+    def __init__(self, time_of_day, timezone):
+        self.time_of_day = datetime.datetime.strptime(time_of_day, '%H:%M').time()
+        self.timezone = timezone
+
+    def get_next_time(self, after):
+        local_after = after.astimezone(self.timezone)
+        for days in (0, 1):
+            next_date = local_after.date() + datetime.timedelta(days=days)
+            # Localized day by day, so the time of the day is kept across the daylight saving time changes
+            next_time = self.timezone.localize(datetime.datetime.combine(next_date, self.time_of_day))
+            if next_time > local_after:
+                return next_time
+
+    def __str__(self):
+        return f"every day at {self.time_of_day.strftime('%H:%M')} {self.timezone}"
+
+
+class Job:
+    """Function run by the scheduler when any of its triggers fires"""
+
+    def __init__(self, name, function, triggers, now):
+        self.name = name
+        self.function = function
+        self.triggers = triggers
+        self.next_times = [trigger.get_next_time(now) for trigger in triggers]
+        self.running_since = None
+        self.last_run = None
+        self.last_duration_seconds = None
+        self.runs = 0
+        self.coalesced_triggers = 0
+
+    @property
+    def next_time(self):
+        return min(self.next_times)
+
+    def count_due_triggers(self, now):
+        coalesce_until = now + datetime.timedelta(seconds=SCHEDULER_COALESCE_SECONDS)
+        return sum(next_time <= coalesce_until for next_time in self.next_times)
+
+    def reschedule(self, now):
+        """Next times of the triggers after a run ended at now. Triggers due by the end of the coalescing window,
+        fired while the job was running too, are covered by the run. Return how many were coalesced into it"""
+        coalesced_triggers = self.count_due_triggers(now) - 1
+        coalesce_until = now + datetime.timedelta(seconds=SCHEDULER_COALESCE_SECONDS)
+        self.next_times = [trigger.get_next_time(now) for trigger in self.triggers]
+        self.next_times = [trigger.get_next_time(coalesce_until) if next_time <= coalesce_until else next_time
+                           for trigger, next_time in zip(self.triggers, self.next_times)]
+        return max(coalesced_triggers, 0)
+
+    def get_status(self, now):
+        running_seconds = (now - self.running_since).total_seconds() if self.running_since else None
+        return {'name': self.name,
+                'state': 'running' if self.running_since else 'pending',
+                'triggers': [str(trigger) for trigger in self.triggers],
+                'next_run': self.next_time.isoformat(),
+                'running_seconds': round(running_seconds, 2) if running_seconds is not None else None,
+                'last_run': self.last_run.isoformat() if self.last_run else None,
+                'last_duration_seconds': self.last_duration_seconds,
+                'runs': self.runs,
+                'coalesced_triggers': self.coalesced_triggers}
+
+
+class Scheduler:
+    """Runs jobs at the times of their triggers, in a timezone, one job at a time.
+
+    Jobs never overlap: a trigger firing while a job runs waits for it to finish. Triggers of a job which fire within
+    SCHEDULER_COALESCE_SECONDS of each other, or while the job is waiting, are coalesced into a single run.
+    """
+
+    def __init__(self, timezone):
+        self.timezone = timezone
+        self.jobs = []
+        self.lock = threading.Lock()
+        # Set when a job is added, so that the runner computes again the time of the next job
+        self.jobs_changed = threading.Event()
+
+    def now(self):
+        return datetime.datetime.now(self.timezone)
+
+    def daily_at(self, time_of_day):
+        return DailyTrigger(time_of_day, self.timezone)
+
+    def add_job(self, name, function, triggers):
+        with self.lock:
+            job = Job(name, function, triggers, self.now())
+            self.jobs.append(job)
+        log.info(f"Job {name} scheduled {', '.join(str(trigger) for trigger in triggers)}, next run at "
+                 f"{job.next_time.strftime('%d/%m/%Y %H:%M:%S')}")
+        self.jobs_changed.set()
+        return job
+
+    def get_status(self):
+        """Jobs running and pending, in the order they run"""
+        now = self.now()
+        with self.lock:
+            jobs = sorted(self.jobs, key=lambda job: (job.running_since is None, job.next_time))
+            return [job.get_status(now) for job in jobs]
+
+    def run_job(self, job):
+        now = self.now()
+        with self.lock:
+            job.running_since = now
+        due_triggers = job.count_due_triggers(now)
+        if due_triggers > 1:
+            log.info(f"Job {job.name}: {due_triggers} triggers coalesced into a single run")
+        start_time = time.time()
+        try:
+            job.function()
+        except Exception as e:
+            log.error(f"Job {job.name} failed. Reason: {e}")
+        finally:
+            with self.lock:
+                job.running_since = None
+                job.last_run = now
+                job.last_duration_seconds = round(time.time() - start_time, 2)
+                job.runs += 1
+                job.coalesced_triggers += job.reschedule(self.now())
+
+    def run(self):
+        while True:
+            with self.lock:
+                job = min(self.jobs, key=lambda job: job.next_time, default=None)
+            wait_seconds = (job.next_time - self.now()).total_seconds() if job else None
+            if wait_seconds is None or wait_seconds > 0:
+                self.jobs_changed.wait(wait_seconds)
+                self.jobs_changed.clear()
+                continue
+            self.run_job(job)
+
+    def start(self):
+        scheduler_thread = threading.Thread(name="scheduler-thread", target=self.run, daemon=True)
+        scheduler_thread.start()
+
+
+scheduler = Scheduler(pytz.timezone(SCHEDULER_TIMEZONE))
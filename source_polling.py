@@ -0,0 +1,201 @@
+import datetime
+import json
+import os
+import time
+
+import numpy as np
+import pytz
+
+import logger
+from constants import FETCH_LOG_FILE, FETCH_LOG_RETENTION_DAYS, LIST_OF_DATA_SOURCE_URLS, POLLING_BASE_SECONDS, \
+    POLLING_MAX_SECONDS, POLLING_WINDOW_SECONDS, POLLING_WINDOW_MARGIN_MINUTES, POLLING_MIN_CHANGES, \
+    POLLING_DUE_TOLERANCE_SECONDS, SCHEDULER_TIMEZONE
+
+log = logger.get_logger()
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class FetchLog:
+    """Time and content version of every check of the data sources, None as version when the check failed.
+
+    Checks are appended to a file shared by the processes checking the sources, and kept for FETCH_LOG_RETENTION_DAYS.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Check times and versions by url, loaded again when another process changes the file
+        self.checks = {}
+        self.file_state = None
+
+    def load(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.checks, self.file_state = {}, None
+            return
+        if (stat.st_size, stat.st_mtime_ns) == self.file_state:
+            return
+        checks = {}
+        with open(self.path, 'r') as log_file:
+            for line in log_file:
+                # A line being written by another process could be incomplete
+                try:
+                    check = json.loads(line)
+                except ValueError:
+                    continue
+                checks.setdefault(check['url'], []).append((check['time'], check['version']))
+        self.checks, self.file_state = checks, (stat.st_size, stat.st_mtime_ns)
+
+    def get_checks(self, url):
+        self.load()
+        return self.checks.get(url, [])
+
+    def record(self, fetch_results, check_time=None):
+        check_time = check_time or time.time()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a') as log_file:
+            for url, fetch_result in fetch_results.items():
+                log_file.write(json.dumps({'url': url, 'time': check_time,
+                                           'version': fetch_result.version if fetch_result else None}) + '\n')
+        self.remove_old_checks(check_time)
+
+    def remove_old_checks(self, now):
+        self.load()
+        oldest_time = now - FETCH_LOG_RETENTION_DAYS * 86400
+        # Rewritten at most once a day, when the oldest checks are older than the retention by a day
+        if all(checks[0][0] >= oldest_time - 86400 for checks in self.checks.values()):
+            return
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, 'w') as log_file:
+            for url, checks in self.checks.items():
+                for check_time, version in checks:
+                    if check_time >= oldest_time:
+                        log_file.write(json.dumps({'url': url, 'time': check_time, 'version': version}) + '\n')
+        os.replace(temporary_path, self.path)
+
+
+class SourcePolling:
+    """Cadence of the checks of every data source, learned from the times its content changed in the fetch log.
+
+    The publication window of a source is the part of the day (in the scheduler timezone) holding most of its changes,
+    once it changed at least POLLING_MIN_CHANGES times. Inside the window the source is checked every
+    POLLING_WINDOW_SECONDS until it changes. Outside it the interval from the last check doubles at every check
+    without changes, from POLLING_BASE_SECONDS up to POLLING_MAX_SECONDS, but the source is always checked when its
+    next window starts. Sources without a publication window are checked every POLLING_BASE_SECONDS.
+    """
+
+    def __init__(self, urls, fetch_log, timezone):
+        self.urls = urls
+        self.fetch_log = fetch_log
+        self.timezone = timezone
+
+    def get_change_times(self, checks):
+        # The first version seen is not a change, the source could have changed at any time before
+        change_times = []
+        last_version = None
+        for check_time, version in checks:
+            if version is None:
+                continue
+            if last_version is not None and version != last_version:
+                change_times.append(check_time)
+            last_version = version
+        return change_times
+
+    def get_publication_window(self, change_times):
+        """Start and end of the publication window in minutes from the midnight of its day, the end is after 24 * 60
+        when the window crosses midnight. None without enough changes"""
+        if len(change_times) < POLLING_MIN_CHANGES:
+            return None
+        minutes = np.sort([local_time.hour * 60 + local_time.minute
+                           for local_time in (datetime.datetime.fromtimestamp(change_time, self.timezone)
+                                              for change_time in change_times)])
+        # The day is circular: it is cut at the largest gap between the changes, so changes around midnight (e.g. at
+        # 23:50 and 00:10) make a single window instead of one covering the whole day
+        gaps = np.diff(np.append(minutes, minutes[0] + MINUTES_PER_DAY))
+        cut = minutes[(np.argmax(gaps) + 1) % len(minutes)]
+        start, end = np.percentile((minutes - cut) % MINUTES_PER_DAY, [10, 90]) + cut
+        start, end = start - POLLING_WINDOW_MARGIN_MINUTES, end + POLLING_WINDOW_MARGIN_MINUTES
+        return start % MINUTES_PER_DAY, start % MINUTES_PER_DAY + min(end - start, MINUTES_PER_DAY)
+
+    def get_window_times(self, window, day):
+        """Start and end times of the publication window starting in a day"""
+        midnight = self.timezone.localize(datetime.datetime.combine(day, datetime.time()))
+        return [self.timezone.normalize(midnight + datetime.timedelta(minutes=minutes)).timestamp()
+                for minutes in window]
+
+    def get_next_check_time(self, url):
+        checks = self.fetch_log.get_checks(url)
+        if not checks:
+            return 0
+        last_check_time, last_version = checks[-1]
+        change_times = self.get_change_times(checks)
+        window = self.get_publication_window(change_times)
+        if window is None or last_version is None:
+            return last_check_time + POLLING_BASE_SECONDS
+
+        last_check_day = datetime.datetime.fromtimestamp(last_check_time, self.timezone).date()
+        # The window of the day before is still open when it crosses midnight
+        window_day = last_check_day - datetime.timedelta(days=1)
+        window_start, window_end = self.get_window_times(window, window_day)
+        if last_check_time >= window_end:
+            window_day = last_check_day
+            window_start, window_end = self.get_window_times(window, window_day)
+        last_change_time = change_times[-1]
+        if window_start <= last_check_time < window_end and last_change_time < window_start:
+            return last_check_time + POLLING_WINDOW_SECONDS
+        unchanged_checks = sum(check_time > last_change_time and version is not None
+                               for check_time, version in checks)
+        interval = min(POLLING_BASE_SECONDS * 2 ** min(unchanged_checks, 16), POLLING_MAX_SECONDS)
+        if last_check_time >= window_start:
+            window_start = self.get_window_times(window, window_day + datetime.timedelta(days=1))[0]
+        return min(last_check_time + interval, window_start)
+
+    def get_due_urls(self, now=None):
+        now = now or time.time()
+        return [url for url in self.urls if self.get_next_check_time(url) <= now + POLLING_DUE_TOLERANCE_SECONDS]
+
+    def get_next_time(self, after):
+        """Time of the next check of any source, after a time"""
+        next_check_time = min(self.get_next_check_time(url) for url in self.urls)
+        return max(datetime.datetime.fromtimestamp(next_check_time, self.timezone), after)
+
+    def get_status(self):
+        status = []
+        for url in self.urls:
+            checks = self.fetch_log.get_checks(url)
+            change_times = self.get_change_times(checks)
+            window = self.get_publication_window(change_times)
+            status.append({'url': url,
+                           'publication_window': [format_minutes(minutes) for minutes in window] if window else None,
+                           'checks': len(checks),
+                           'changes': len(change_times),
+                           'last_check': format_time(checks[-1][0], self.timezone) if checks else None,
+                           'last_change': format_time(change_times[-1], self.timezone) if change_times else None,
+                           'next_check': format_time(self.get_next_check_time(url), self.timezone)})
+        return status
+
+
+def format_minutes(minutes):
+    minutes = int(minutes) % MINUTES_PER_DAY
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def format_time(timestamp, timezone):
+    return datetime.datetime.fromtimestamp(timestamp, timezone).isoformat()
+
+
+class PollingTrigger:
+    """Fires when a data source has to be checked again, see SourcePolling"""
+
+    def __init__(self, source_polling):
+        self.source_polling = source_polling
+
+    def get_next_time(self, after):
+        return self.source_polling.get_next_time(after)
+
+    def __str__(self):
+        return "when a data source has to be checked"
+
+
+source_polling = SourcePolling(LIST_OF_DATA_SOURCE_URLS, FetchLog(FETCH_LOG_FILE), pytz.timezone(SCHEDULER_TIMEZONE))
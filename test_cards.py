@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from cards import create_cards_by_entity
+
+
+def test_cards_by_entity_keep_integer_counts_with_an_entity_without_previous_row():
+    # 'Placeholder' has a single row, so the previous values of the table are floats with a NaN
+    df_latest = pd.DataFrame({'Country': ['US', 'Placeholder'],
+                              'Confirmed': np.array([31500000, 0], dtype='int64'),
+                              'Confirmed_previous': [30000000.0, np.nan],
+                              'Active_cases': np.array([1000000, 0], dtype='int64'),
+                              'Active_cases_previous': [1000000.0, np.nan],
+                              'Deaths': np.array([2000000, 0], dtype='int64'),
+                              'Deaths_previous': [1999000.0, np.nan]})
+    cards = create_cards_by_entity('country_world', df_latest, 'Country')
+
+    assert cards['US']['Confirmed'].text == '31500000'
+    assert cards['US']['Confirmed'].variation_text == '+1500000'
+    assert cards['US']['Active_cases'].variation_text == '0'
+    assert cards['US']['Deaths'].text == '2000000'
+    assert cards['US']['Deaths'].variation_text == '+1000'
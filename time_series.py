@@ -0,0 +1,20 @@
+import pandas as pd
+
+
+def calculate_daily_values(cumulative_values, first_value=0):
+    """Variation of each value of a cumulative series from the previous row, first_value for the first row.
+
+    Corrections of the cumulative values are kept as negative daily values and after missing days the daily value
+    covers the whole gap. Integer series give int64 values, unless some values are missing.
+    """
+    daily_values = cumulative_values.diff()
+    if len(daily_values):
+        daily_values.iloc[0] = first_value
+    if pd.api.types.is_integer_dtype(cumulative_values.dtype) and not daily_values.isna().any():
+        return daily_values.astype('int64')
+    return daily_values
+
+
+def calculate_rolling_average(values, window=7):
+    """Average of each value with the previous window - 1 ones, the first ones use the values available"""
+    return values.rolling(window=window, min_periods=1).mean()
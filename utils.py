@@ -1,15 +1,18 @@
-import csv
 import json
+import locale
 import os
-from urllib.request import urlopen
 
 import datetime
+import time
 import requests
 import pandas as pd
-import json as js
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import logger
 from constants import GITHUB_USER_ENV_VAR, GITHUB_ACCESS_TOKEN_ENV_VAR, DEBUG_MODE_ENV_VAR, REPO_NAME, \
-    CURRENT_LOCALE_ENV_VAR, ONE_SIGNAL_TEST_API_KEY_ENV_VAR, ONE_SIGNAL_PROD_API_KEY_ENV_VAR
+    CURRENT_LOCALE_ENV_VAR, ONE_SIGNAL_TEST_API_KEY_ENV_VAR, ONE_SIGNAL_PROD_API_KEY_ENV_VAR, CSV_PARSE_ENGINE_ENV_VAR, \
+    CSV_CHUNK_SIZE_ROWS, DATA_LOADER_ENV_VAR, REFRESH_IN_SUBPROCESS_ENV_VAR
+from http_client import http_client
 from one_signal import OneSignal
 
 log = logger.get_logger()
@@ -28,6 +31,10 @@ class GitApiData:
         self.token = token
 
 
+def format_value_string_to_locale(value):
+    return locale.format_string('%.0f', value, True)
+
+
 def get_options(list_value):
     dict_list = []
     for i in list_value:
@@ -83,14 +90,63 @@ def is_debug_mode_enabled():
         return False
 
 
+def is_data_loader_enabled():
+    data_loader = get_environment_variable(DATA_LOADER_ENV_VAR)
+    if data_loader.lower() == 'true':
+        return True
+    elif data_loader.lower() == 'false':
+        log.info(f"{DATA_LOADER_ENV_VAR} is disabled, data are read from the snapshots published by the data loader")
+        return False
+    elif data_loader == "":
+        log.info(f"{DATA_LOADER_ENV_VAR} is not set in your Environment Configuration. Setting True as default")
+        return True
+    else:
+        log.error(f"{DATA_LOADER_ENV_VAR} was not set correctly, it expect True or False as value. Setting True as "
+                  f"default")
+        return True
+
+
+def is_refresh_in_subprocess_enabled():
+    refresh_in_subprocess = get_environment_variable(REFRESH_IN_SUBPROCESS_ENV_VAR)
+    if refresh_in_subprocess.lower() == 'true':
+        return True
+    elif refresh_in_subprocess.lower() == 'false':
+        log.info(f"{REFRESH_IN_SUBPROCESS_ENV_VAR} is disabled, data are refreshed by a thread of the web application")
+        return False
+    elif refresh_in_subprocess == "":
+        log.info(f"{REFRESH_IN_SUBPROCESS_ENV_VAR} is not set in your Environment Configuration. Setting True as "
+                 f"default")
+        return True
+    else:
+        log.error(f"{REFRESH_IN_SUBPROCESS_ENV_VAR} was not set correctly, it expect True or False as value. Setting "
+                  f"True as default")
+        return True
+
+
+def get_csv_parse_engine():
+    engine = get_environment_variable(CSV_PARSE_ENGINE_ENV_VAR).lower()
+    if engine == 'pyarrow':
+        log.info(f"{CSV_PARSE_ENGINE_ENV_VAR} is set, CSV files with a schema are parsed by pyarrow")
+        return engine
+    elif engine not in ('', 'pandas'):
+        log.error(f"{CSV_PARSE_ENGINE_ENV_VAR} was not set correctly, it expect pandas or pyarrow as value. Setting "
+                  f"pandas as default")
+    return 'pandas'
+
+
 git_user_data = GitApiData(*load_git_environment_variables())
+csv_parse_engine = get_csv_parse_engine()
 
 
 # TODO Remember to set the environment variables for the GitHub user and token in your IDE to get access to the Git
 #  API locally TODO Remember to set these also in Heroku Config Vars
 def get_version():
-    resp = requests.get(f'https://api.github.com/repos/{git_user_data.user}/{REPO_NAME}/tags',
-                        auth=(git_user_data.user, git_user_data.token))
+    try:
+        resp = http_client.get(f'https://api.github.com/repos/{git_user_data.user}/{REPO_NAME}/tags',
+                               auth=(git_user_data.user, git_user_data.token))
+    except requests.RequestException as e:
+        log.info(f"It was not possible to access GitHub API, retry later. Reason: {e}")
+        return ""
 
     if resp.status_code == 401:
         log.info("Unauthorized access to GitHub API, check your credentials")
@@ -106,28 +162,81 @@ def get_version():
     return version
 
 
-def load_csv_from_file(path):
-    reader = csv.reader(open(path, 'r'))
-    d = {}
-    for row in reader:
-        k, v = row
-        d[k] = v
-    return d
-
-
-def load_csv(url, data_string=None):
-    if data_string is not None:
+def load_csv(url, data_string=None, schema=None, source_url=None):
+    start_time = time.time()
+    if schema is not None:
+        data_loaded = load_csv_with_schema(url, schema)
+    elif data_string is not None:
         data_loaded = pd.read_csv(url, parse_dates=[data_string])
     else:
         data_loaded = pd.read_csv(url)
-    log.info(f"Data loaded at {datetime.datetime.now().time()}")
+    memory_size = data_loaded.memory_usage(deep=True).sum()
+    log.info(f"Data loaded at {datetime.datetime.now().time()} from {source_url or url}: {len(data_loaded)} rows "
+             f"parsed in {round(time.time() - start_time, 3)} seconds, {round(memory_size / 1024 ** 2, 2)} MB in memory")
     return data_loaded
 
 
-def load_geojson(url):
-    with urlopen(url) as response:
-        json = js.load(response)
-    return json
+def load_csv_with_schema(url, schema):
+    if csv_parse_engine == 'pyarrow':
+        data_loaded = read_csv_with_pyarrow(url, schema)
+    else:
+        data_loaded = pd.read_csv(url, usecols=schema.usecols, dtype=schema.dtype)
+    return parse_date_columns(data_loaded, schema)
+
+
+def load_csv_in_chunks(url, schema):
+    """Yield the rows of the CSV file in DataFrames of bounded size, the file is never loaded entirely"""
+    if csv_parse_engine == 'pyarrow':
+        chunks = (batch.to_pandas().astype(schema.dtype) for batch in
+                  pa_csv.open_csv(url, convert_options=create_pyarrow_convert_options(schema)))
+    else:
+        chunks = pd.read_csv(url, usecols=schema.usecols, dtype=schema.dtype, chunksize=CSV_CHUNK_SIZE_ROWS)
+    for chunk in chunks:
+        yield parse_date_columns(chunk, schema)
+
+
+def aggregate_csv_in_chunks(url, schema, group_by_columns, value_columns):
+    """Return a dict with the sum of value_columns grouped by each column of group_by_columns.
+
+    The file is folded chunk by chunk, so the memory used depends on the number of groups and not on the file size.
+    """
+    start_time = time.time()
+    aggregates = dict.fromkeys(group_by_columns)
+    for chunk in load_csv_in_chunks(url, schema):
+        for column in group_by_columns:
+            partial_aggregate = chunk.groupby(column, observed=True)[value_columns].sum()
+            if isinstance(partial_aggregate.index, pd.CategoricalIndex):
+                # Categories differ between chunks, plain values are needed to merge the partial results
+                partial_aggregate.index = partial_aggregate.index.astype(str)
+            if aggregates[column] is not None:
+                partial_aggregate = pd.concat([aggregates[column], partial_aggregate]).groupby(level=0).sum()
+            aggregates[column] = partial_aggregate
+    log.info(f"Data aggregated at {datetime.datetime.now().time()} from {url} in "
+             f"{round(time.time() - start_time, 3)} seconds")
+    return {column: aggregate.reset_index() for column, aggregate in aggregates.items()}
+
+
+def parse_date_columns(data_loaded, schema):
+    for date_column in schema.date_columns:
+        try:
+            data_loaded[date_column] = pd.to_datetime(data_loaded[date_column], format=schema.date_format)
+        except ValueError:
+            log.error(f"Column '{date_column}' does not match the format {schema.date_format}, inferring it")
+            data_loaded[date_column] = pd.to_datetime(data_loaded[date_column])
+    return data_loaded
+
+
+def create_pyarrow_convert_options(schema):
+    # Categories are converted after the parsing, pyarrow reads them as plain strings
+    column_types = {column: pa.string() if dtype == 'category' else pa.from_numpy_dtype(dtype)
+                    for column, dtype in schema.dtype.items()}
+    column_types.update({column: pa.string() for column in schema.date_columns})
+    return pa_csv.ConvertOptions(include_columns=schema.usecols, column_types=column_types)
+
+
+def read_csv_with_pyarrow(url, schema):
+    data_loaded = pa_csv.read_csv(url, convert_options=create_pyarrow_convert_options(schema)).to_pandas()
+    return data_loaded.astype(schema.dtype)
 
 
 def create_one_signal():